@@ -0,0 +1,10 @@
+-- Índice único sobre a tripla (from, to, type): permite o UPSERT de
+-- relações em database.add_relation e impede duplicatas na origem.
+-- Colapsa triplas repetidas já existentes antes de criar o índice.
+DELETE FROM relations WHERE id NOT IN (
+    SELECT MIN(id) FROM relations
+    GROUP BY from_entity_id, to_entity_id, relation_type
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_relations_triple
+    ON relations(from_entity_id, to_entity_id, relation_type);
@@ -0,0 +1,6 @@
+-- Índice composto cobrindo o lookup (name, entity_type) de add_entity:
+-- o id (rowid) vem junto na entrada do índice, então a consulta resolve
+-- sem buscar a linha na tabela (SEARCH USING COVERING INDEX).
+-- Mesma definição que content_processor garante via _ensure_database_schema.
+CREATE INDEX IF NOT EXISTS idx_entities_name_type
+    ON entities(name COLLATE NOCASE, entity_type);
@@ -4,20 +4,60 @@ Simple HTTP server to serve the web interface for testing.
 Serves the index.html file and provides CORS support for API calls.
 """
 
+import gzip
 import http.server
-import socketserver
 import os
 from pathlib import Path
 
+# Text assets worth compressing before sending to the browser
+COMPRESSIBLE_SUFFIXES = {'.js', '.css', '.html', '.json'}
+
+# Compressed blobs keyed by path -> (mtime, blob) so repeated requests
+# skip re-compression until the file changes
+_gzip_cache = {}
+
 
 class CORSHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
-    """HTTP request handler with CORS support."""
-    
+    """HTTP request handler with CORS and gzip support."""
+
+    def do_GET(self):
+        """Serve gzip-compressed content for large text assets."""
+        file_path = Path(self.translate_path(self.path))
+        accepts_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+        if accepts_gzip and file_path.suffix.lower() in COMPRESSIBLE_SUFFIXES:
+            try:
+                self._serve_gzipped(file_path)
+                return
+            except OSError:
+                pass  # fall back to the uncompressed default handler
+        super().do_GET()
+
+    def _serve_gzipped(self, file_path):
+        """Send a cached gzip-compressed copy of file_path."""
+        mtime = file_path.stat().st_mtime
+        cached = _gzip_cache.get(str(file_path))
+        if cached is None or cached[0] != mtime:
+            # level 1 is nearly free and still shrinks JS/CSS several-fold
+            blob = gzip.compress(file_path.read_bytes(), compresslevel=1)
+            _gzip_cache[str(file_path)] = (mtime, blob)
+        else:
+            blob = cached[1]
+
+        self.send_response(200)
+        self.send_header('Content-Type', self.guess_type(str(file_path)))
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(blob)))
+        self.end_headers()
+        self.wfile.write(blob)
+
     def end_headers(self):
         """Add CORS headers to all responses."""
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+        # no-cache: this server exists for local testing, edits must show
+        # up on the next reload (revalidation still allows 304s)
+        self.send_header('Cache-Control', 'no-cache')
         super().end_headers()
     
     def do_OPTIONS(self):
@@ -37,11 +77,13 @@ def serve_web_interface(port=3000):
     project_root = Path(__file__).parent.parent
     os.chdir(project_root)
     
-    # Create HTTP server
+    # Threaded server: one slow asset request no longer blocks the rest, and
+    # SimpleHTTPRequestHandler's copyfile keeps the sendfile fast path.
     handler = CORSHTTPRequestHandler
-    
+
     try:
-        with socketserver.TCPServer(("", port), handler) as httpd:
+        with http.server.ThreadingHTTPServer(("", port), handler) as httpd:
+            httpd.daemon_threads = True
             print(f"✅ Serving web interface at http://localhost:{port}")
             print(f"📁 Serving from: {project_root}")
             print(f"🌐 Open http://localhost:{port} in your browser")
@@ -4,14 +4,144 @@ Manual validation script for the enhanced web interface.
 Tests browser loading, API connectivity, and feature functionality.
 """
 
+import re
 import webbrowser
 import subprocess
 import time
 import sys
 import signal
+import socket
 import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+HTML_PATH = Path("/Users/davisimite/Documents/muleta-cognitiva/index.html")
+
+
+def read_interface_html():
+    """Read index.html once so the validators can share the content."""
+    if not HTML_PATH.exists():
+        return None
+    with open(HTML_PATH, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+REQUIRED_HTML_ELEMENTS = frozenset([
+    'class="app-container"',
+    'class="sidebar"',
+    'class="main-content"',
+    'class="nav-tabs"',
+    'id="chart"',
+    'id="learning-dashboard"',
+    'id="argument-flows"',
+    'id="assessments"',
+    'id="reviewChart"',
+    'id="cardTypeChart"',
+    'id="argumentChart"',
+    'id="assessmentChart"',
+    'id="knowledgeGapChart"',
+    'echarts.min.js',
+])
+
+REQUIRED_JS_FUNCTIONS = frozenset([
+    'function escapeHtml',
+    'function changeGraphType',
+    'function showTab',
+    'function selectEntity',
+    'function refreshData',
+    'function loadVisualizationData',
+    'function loadLearningDashboard',
+    'function loadArgumentFlows',
+    'function loadAssessments',
+    'function makeForceOption',
+    'function makeCircularOption',
+    'function makeFlowchartOption',
+    'function generateCards',
+    'function createArgumentSequence',
+])
+
+REQUIRED_CSS_CLASSES = frozenset([
+    '.app-container',
+    '.sidebar',
+    '.main-content',
+    '.nav-tabs',
+    '.nav-tab',
+    '.tab-content',
+    '.tab-pane',
+    '.learning-dashboard',
+    '.stats-grid',
+    '.stat-card',
+    '.chart-container',
+    '.controls',
+    '.entity-list',
+    '.entity-item',
+    '.status-indicator',
+])
+
+
+def _compile_tokens(tokens):
+    """Compile one alternation of literal tokens, longest first."""
+    ordered = sorted(tokens, key=len, reverse=True)
+    return re.compile("|".join(map(re.escape, ordered)))
+
+
+_HTML_PATTERN = _compile_tokens(REQUIRED_HTML_ELEMENTS)
+_JS_PATTERN = _compile_tokens(REQUIRED_JS_FUNCTIONS)
+_CSS_PATTERN = _compile_tokens(REQUIRED_CSS_CLASSES)
+
+
+def find_missing_tokens(content, pattern, required_tokens):
+    """Return the required tokens absent from content using one linear scan.
+
+    A single precompiled alternation of literals replaces one full-content
+    substring scan per token.
+    """
+    found = {match.group() for match in pattern.finditer(content)}
+    return sorted(required_tokens - found)
+
+
+def drain_pipes(process):
+    """Continuously drain a child's stdout/stderr into a bounded tail.
+
+    Without this the ~64KB kernel pipe buffer eventually fills and the
+    child blocks in write(), freezing the server mid-run. The last lines
+    are kept on process.log_tail for diagnostics.
+    """
+    tail = deque(maxlen=1000)
+
+    def pump(stream):
+        for line in iter(stream.readline, ''):
+            tail.append(line)
+
+    for stream in (process.stdout, process.stderr):
+        if stream is not None:
+            threading.Thread(target=pump, args=(stream,), daemon=True).start()
+
+    process.log_tail = tail
+    return process
+
+
+def wait_for_port(port, process=None, timeout=10.0):
+    """Poll a TCP port until it accepts connections or the process dies.
+
+    Returns as soon as the listener is up instead of sleeping a fixed
+    number of seconds, and fails fast when the child exits early.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            tail = "".join(getattr(process, 'log_tail', ()))
+            print(f"❌ Server process exited early: {tail[-500:]}")
+            return False
+        try:
+            with socket.create_connection(("localhost", port), timeout=0.1):
+                return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
 
 def start_api_server():
     """Start the API server in the background."""
@@ -21,9 +151,15 @@ def start_api_server():
             ["uv", "run", "uvicorn", "src.api.main:app", "--host", "localhost", "--port", "8000"],
             cwd="/Users/davisimite/Documents/muleta-cognitiva",
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
         )
-        time.sleep(3)  # Wait for server to start
+        drain_pipes(api_process)
+        if not wait_for_port(8000, api_process):
+            print("❌ API server did not become ready")
+            api_process.terminate()
+            return None
         print("✅ API server started on http://localhost:8000")
         return api_process
     except Exception as e:
@@ -39,9 +175,15 @@ def start_web_server():
             ["python3", "scripts/serve_web.py", "--port", "3000"],
             cwd="/Users/davisimite/Documents/muleta-cognitiva",
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
         )
-        time.sleep(2)  # Wait for server to start
+        drain_pipes(web_process)
+        if not wait_for_port(3000, web_process):
+            print("❌ Web server did not become ready")
+            web_process.terminate()
+            return None
         print("✅ Web server started on http://localhost:3000")
         return web_process
     except Exception as e:
@@ -49,41 +191,12 @@ def start_web_server():
         return None
 
 
-def validate_html_structure():
+def validate_html_structure(content):
     """Validate the HTML structure of index.html."""
     print("\n📋 Validating HTML structure...")
-    
-    html_path = Path("/Users/davisimite/Documents/muleta-cognitiva/index.html")
-    if not html_path.exists():
-        print("❌ index.html not found")
-        return False
-    
-    with open(html_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Check for required elements
-    required_elements = [
-        'class="app-container"',
-        'class="sidebar"',
-        'class="main-content"',
-        'class="nav-tabs"',
-        'id="chart"',
-        'id="learning-dashboard"',
-        'id="argument-flows"',
-        'id="assessments"',
-        'id="reviewChart"',
-        'id="cardTypeChart"',
-        'id="argumentChart"',
-        'id="assessmentChart"',
-        'id="knowledgeGapChart"',
-        'echarts.min.js'
-    ]
-    
-    missing_elements = []
-    for element in required_elements:
-        if element not in content:
-            missing_elements.append(element)
-    
+
+    missing_elements = find_missing_tokens(content, _HTML_PATTERN, REQUIRED_HTML_ELEMENTS)
+
     if missing_elements:
         print("❌ Missing HTML elements:")
         for element in missing_elements:
@@ -94,36 +207,12 @@ def validate_html_structure():
     return True
 
 
-def validate_javascript_functions():
+def validate_javascript_functions(content):
     """Validate presence of required JavaScript functions."""
     print("\n🔧 Validating JavaScript functions...")
-    
-    html_path = Path("/Users/davisimite/Documents/muleta-cognitiva/index.html")
-    with open(html_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    required_functions = [
-        'function escapeHtml',
-        'function changeGraphType',
-        'function showTab',
-        'function selectEntity',
-        'function refreshData',
-        'function loadVisualizationData',
-        'function loadLearningDashboard',
-        'function loadArgumentFlows',
-        'function loadAssessments',
-        'function makeForceOption',
-        'function makeCircularOption',
-        'function makeFlowchartOption',
-        'function generateCards',
-        'function createArgumentSequence'
-    ]
-    
-    missing_functions = []
-    for func in required_functions:
-        if func not in content:
-            missing_functions.append(func)
-    
+
+    missing_functions = find_missing_tokens(content, _JS_PATTERN, REQUIRED_JS_FUNCTIONS)
+
     if missing_functions:
         print("❌ Missing JavaScript functions:")
         for func in missing_functions:
@@ -134,37 +223,12 @@ def validate_javascript_functions():
     return True
 
 
-def validate_css_classes():
+def validate_css_classes(content):
     """Validate presence of required CSS classes."""
     print("\n🎨 Validating CSS classes...")
-    
-    html_path = Path("/Users/davisimite/Documents/muleta-cognitiva/index.html")
-    with open(html_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    required_classes = [
-        '.app-container',
-        '.sidebar',
-        '.main-content',
-        '.nav-tabs',
-        '.nav-tab',
-        '.tab-content',
-        '.tab-pane',
-        '.learning-dashboard',
-        '.stats-grid',
-        '.stat-card',
-        '.chart-container',
-        '.controls',
-        '.entity-list',
-        '.entity-item',
-        '.status-indicator'
-    ]
-    
-    missing_classes = []
-    for css_class in required_classes:
-        if css_class not in content:
-            missing_classes.append(css_class)
-    
+
+    missing_classes = find_missing_tokens(content, _CSS_PATTERN, REQUIRED_CSS_CLASSES)
+
     if missing_classes:
         print("❌ Missing CSS classes:")
         for css_class in missing_classes:
@@ -191,17 +255,25 @@ def test_api_connectivity():
         ]
         
         base_url = "http://localhost:8000"
-        
-        for endpoint in endpoints:
+
+        def ping(endpoint):
             try:
                 response = urllib.request.urlopen(f"{base_url}{endpoint}", timeout=5)
-                if response.status in [200, 404]:  # 404 is OK for empty database
-                    print(f"✅ {endpoint} - Status: {response.status}")
-                else:
-                    print(f"⚠️  {endpoint} - Status: {response.status}")
+                return endpoint, response.status, None
             except Exception as e:
-                print(f"❌ {endpoint} - Error: {e}")
-        
+                return endpoint, None, e
+
+        # Ping the endpoints in parallel: total time is the slowest request
+        # instead of the sum of all of them
+        with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+            for endpoint, status, error in executor.map(ping, endpoints):
+                if error is not None:
+                    print(f"❌ {endpoint} - Error: {error}")
+                elif status in [200, 404]:  # 404 is OK for empty database
+                    print(f"✅ {endpoint} - Status: {status}")
+                else:
+                    print(f"⚠️  {endpoint} - Status: {status}")
+
         return True
         
     except Exception as e:
@@ -291,18 +363,23 @@ def main():
     print("🚀 MULETA COGNITIVA - WEB INTERFACE VALIDATION")
     print("=" * 60)
     
-    # Validation phase
-    validation_passed = True
-    
-    if not validate_html_structure():
-        validation_passed = False
-    
-    if not validate_javascript_functions():
-        validation_passed = False
-    
-    if not validate_css_classes():
-        validation_passed = False
-    
+    # Validation phase: read the HTML once and share it across validators
+    content = read_interface_html()
+    if content is None:
+        print("❌ index.html not found")
+        return False
+
+    # The three validators are independent, so run them concurrently
+    validators = (
+        validate_html_structure,
+        validate_javascript_functions,
+        validate_css_classes,
+    )
+    with ThreadPoolExecutor(max_workers=len(validators)) as executor:
+        results = list(executor.map(lambda check: check(content), validators))
+
+    validation_passed = all(results)
+
     if not validation_passed:
         print("\n❌ Validation failed. Please fix the issues above.")
         return False
@@ -346,12 +423,14 @@ def main():
         
         print(f"\n⏱️  Press Ctrl+C to stop servers and exit")
         
-        # Keep servers running until user interrupts
+        # Block until Ctrl+C without waking up every second
+        stop = threading.Event()
+        previous_handler = signal.signal(signal.SIGINT, lambda *_: stop.set())
         try:
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            print(f"\n👋 Validation complete!")
+            stop.wait()
+        finally:
+            signal.signal(signal.SIGINT, previous_handler)
+        print(f"\n👋 Validation complete!")
             
     except Exception as e:
         print(f"\n❌ Error during validation: {e}")
@@ -4,14 +4,45 @@ import os
 
 
 class LLMConfig:
-    """Configuration for LLM client."""
+    """Configuration for LLM client.
+
+    Parsed values are cached at class level keyed on a snapshot of the
+    relevant environment variables, so repeated instantiation skips the
+    int/bool re-parsing while still picking up env changes.
+    """
+
+    _cache_key = None
+    _cache_values = None
 
     def __init__(self):
-        self.model = os.environ.get("LLM_MODEL", "deepseek-r1:8b")
-        self.url = os.environ.get(
-            "LOCAL_LLM_URL", "http://localhost:11434/api/generate"
-        )
-        self.timeout = int(os.environ.get("LLM_TIMEOUT", "60"))
-        self.fallback_enabled = (
-            os.environ.get("LLM_FALLBACK_ENABLED", "true").lower() == "true"
+        key = (
+            os.environ.get("LLM_MODEL"),
+            os.environ.get("LOCAL_LLM_URL"),
+            os.environ.get("LLM_TIMEOUT"),
+            os.environ.get("LLM_FALLBACK_ENABLED"),
+            os.environ.get("LLM_MAX_CONCURRENCY"),
         )
+        cls = type(self)
+        if key != cls._cache_key:
+            cls._cache_values = (
+                key[0] or "deepseek-r1:8b",
+                key[1] or "http://localhost:11434/api/generate",
+                int(key[2] or "60"),
+                (key[3] or "true").lower() == "true",
+                int(key[4] or "4"),
+            )
+            cls._cache_key = key
+
+        (
+            self.model,
+            self.url,
+            self.timeout,
+            self.fallback_enabled,
+            self.max_concurrency,
+        ) = cls._cache_values
+
+    @classmethod
+    def refresh(cls):
+        """Drop the cached values so the next instance re-reads the env."""
+        cls._cache_key = None
+        cls._cache_values = None
@@ -3,22 +3,197 @@ Content processor: uses LLMClient to extract entities/relations and store in DB.
 Handles content processing pipeline with proper error handling and validation.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
-import sys
+import sqlite3
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parents[2] / "api"))
-
 from . import database
-from .llm_client import LLMClient, LLMError
 
-# Configure logging to ensure it's visible
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+# INSERT ... RETURNING needs SQLite 3.35; older builds use the
+# executemany + follow-up SELECT path instead
+_SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Stored in PRAGMA user_version once the schema (incl. the extra indexes,
+# extraction cache and FTS index) has been applied; bump when it changes
+_SCHEMA_VERSION = 4
+
+# Hot-path SQL as module constants: stable string identity lets SQLite's
+# prepared-statement cache reuse the compiled programs across instances
+_SQL_UPSERT_ENTITIES_RETURNING = """INSERT INTO entities (name, entity_type, description)
+    SELECT trim(json_extract(e.value, '$.name')),
+           COALESCE(json_extract(e.value, '$.type'), 'conceito'),
+           COALESCE(json_extract(e.value, '$.description'), '')
+    FROM json_each(?) e
+    WHERE true
+    ON CONFLICT(name) DO UPDATE SET name = excluded.name
+    RETURNING id, name"""
+
+_SQL_INSERT_ENTITY_IGNORE = (
+    "INSERT OR IGNORE INTO entities (name, entity_type, description) VALUES (?, ?, ?)"
+)
+
+_SQL_INSERT_OBSERVATIONS = """INSERT OR IGNORE INTO observations
+        (entity_id, content, source_type, source_path, confidence, content_hash, created_at)
+    VALUES (?, ?, ?, ?, 1.0, ?, CURRENT_TIMESTAMP)"""
+
+# NOT EXISTS compares COLLATE NOCASE so a relation naming "python" reuses
+# an existing "Python" row instead of inserting a case-variant duplicate
+# (the UNIQUE(name) index is BINARY and would accept both)
+_SQL_INSERT_RELATION_ENDPOINTS = """INSERT OR IGNORE INTO entities (name, entity_type, description)
+    SELECT DISTINCT trim(json_extract(r.value, '$.from')), 'conceito',
+           'Entidade criada automaticamente a partir de relação'
+    FROM json_each(?) r
+    WHERE trim(COALESCE(json_extract(r.value, '$.from'), '')) <> ''
+      AND NOT EXISTS (
+          SELECT 1 FROM entities e
+          WHERE e.name = trim(json_extract(r.value, '$.from')) COLLATE NOCASE
+      )
+    UNION
+    SELECT DISTINCT trim(json_extract(r.value, '$.to')), 'conceito',
+           'Entidade criada automaticamente a partir de relação'
+    FROM json_each(?) r
+    WHERE trim(COALESCE(json_extract(r.value, '$.to'), '')) <> ''
+      AND NOT EXISTS (
+          SELECT 1 FROM entities e
+          WHERE e.name = trim(json_extract(r.value, '$.to')) COLLATE NOCASE
+      )"""
+
+# Duplicate triples are rejected by idx_relations_triple via OR IGNORE, a
+# B-tree probe instead of a correlated NOT EXISTS subquery per row
+_SQL_INSERT_RELATIONS = """INSERT OR IGNORE INTO relations
+        (from_entity_id, to_entity_id, relation_type, evidence, strength, created_at)
+    SELECT ef.id, et.id,
+           COALESCE(json_extract(r.value, '$.type'), 'relacionado_a'),
+           COALESCE(json_extract(r.value, '$.evidence'), ''),
+           COALESCE(json_extract(r.value, '$.strength'), 1.0),
+           CURRENT_TIMESTAMP
+    FROM json_each(?) r
+    JOIN entities ef ON ef.name = trim(json_extract(r.value, '$.from')) COLLATE NOCASE
+    JOIN entities et ON et.name = trim(json_extract(r.value, '$.to')) COLLATE NOCASE"""
+
+_SQL_CACHE_GET = "SELECT result_json FROM extraction_cache WHERE hash = ?"
+_SQL_CACHE_PUT = (
+    "INSERT OR REPLACE INTO extraction_cache (hash, result_json, created_at) "
+    "VALUES (?, ?, ?)"
 )
+from .llm_client import LLMClient, LLMError, get_llm_client
+
+# Bound on concurrent LLM extractions: the local model saturates quickly,
+# so more in-flight requests only grow its queue. Kept as a count, not a
+# module-level Semaphore — a Semaphore binds to the first event loop that
+# waits on it, and repeated asyncio.run() calls each create a fresh loop
+_LLM_CONCURRENCY = 5
+
+# Library-safe logging: handler/format configuration belongs to the app
+# entrypoint; the NullHandler keeps "no handler" warnings away
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+def _key(name: str) -> str:
+    """Normalize an entity name for map lookups (single-key, case-insensitive)."""
+    return name.strip().casefold()
+
+
+# Rows per executemany dispatch and names per IN() query. The latter stays
+# under SQLite's 999 bound-variable ceiling; the former bounds the peak
+# argument buffer when merged multi-chunk batches grow large.
+_BATCH_ROWS = 500
+_MAX_VARS = 900
+
+# Entries kept in the cross-document (name -> entity id) LRU
+_ID_CACHE_MAX = 50_000
+
+
+def _iter_batches(rows, size):
+    """Yield rows in consecutive slices of at most size items."""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _select_by_names(conn, sql_template, names):
+    """Run an IN()-based SELECT over names, batched under the variable limit."""
+    rows = []
+    for batch in _iter_batches(names, _MAX_VARS):
+        placeholders = ",".join("?" * len(batch))
+        rows.extend(conn.execute(sql_template.format(placeholders), batch))
+    return rows
+
+
+def _chunk_text(text: str, max_chars: int = 2000) -> List[str]:
+    """Split text into roughly max_chars chunks on paragraph boundaries.
+
+    Keeps each LLM call inside a comfortable context budget; a paragraph
+    longer than max_chars is kept whole rather than split mid-sentence.
+    """
+    if len(text) <= max_chars:
+        return [text]
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for paragraph in text.split("\n\n"):
+        if current and size + len(paragraph) > max_chars:
+            chunks.append("\n\n".join(current))
+            current = []
+            size = 0
+        current.append(paragraph)
+        size += len(paragraph) + 2
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def _ocr_image(f: Path) -> List[str]:
+    """OCR an image with tesseract; placeholder chunk when unavailable.
+
+    Output goes to stdout ("-") instead of a sidecar .txt file, skipping
+    the write-then-read-back round trip through disk.
+    """
+    try:
+        result = subprocess.run(
+            ["tesseract", str(f), "-"], check=True, capture_output=True
+        )
+        return [result.stdout.decode("utf-8")]
+    except Exception:
+        # fallback placeholder
+        return [f"[image:{f.name}]"]
+
+
+def _pdf_to_text(f: Path) -> List[str]:
+    """Extract PDF text with pdftotext to stdout, split into per-page chunks."""
+    try:
+        result = subprocess.run(
+            ["pdftotext", str(f), "-"], check=True, capture_output=True
+        )
+        pages = result.stdout.decode("utf-8").split("\f")
+        return [page for page in pages if page.strip()]
+    except Exception:
+        # skip if not available
+        logger.warning("pdftotext not available or failed for %s", f)
+    return []
+
+
+def _read_text_file(f: Path) -> List[str]:
+    """Fallback for unknown file types: read as text, placeholder otherwise."""
+    try:
+        return [f.read_text(encoding="utf-8")]
+    except Exception:
+        return [f"[file:{f.name}]"]
+
+
+# Per-suffix extraction handlers, resolved once per file instead of walking
+# an if/elif chain that rebuilds its set literal on every iteration
+_FILE_HANDLERS = {ext: _ocr_image for ext in (".png", ".jpg", ".jpeg", ".tiff", ".bmp")}
+_FILE_HANDLERS[".pdf"] = _pdf_to_text
 
 
 class ContentProcessingError(Exception):
@@ -32,31 +207,184 @@ class ContentProcessor:
 
     def __init__(
         self,
-        database_path: str = "/Users/davisimite/Documents/muleta-cognitiva/src/api/muleta.db",
+        database_path: Optional[str] = None,
         llm_client: Optional[LLMClient] = None,
     ) -> None:
         """Initialize content processor with database and LLM client."""
-        # store paths and clients on the instance
-        self.db_path = Path(database_path)
-        # Allow injecting a custom LLM client for testing
-        self.llm_client = llm_client or LLMClient()
-
-        logger.debug(f"ContentProcessor initialized with database path: {self.db_path}")
+        # store paths and clients on the instance; the default follows
+        # database.DB_PATH (overridable via MULETA_DB_PATH)
+        self.db_path = Path(database_path) if database_path else database.DB_PATH
+        # Allow injecting a custom LLM client for testing; the default is
+        # the shared singleton so its pooled HTTP connections, TTL'd health
+        # check and result cache survive the per-request ContentProcessor
+        # construction in main.py
+        self.llm = llm_client or get_llm_client()
+        self.llm_client = self.llm
+
+        logger.debug("ContentProcessor initialized with database path: %s", self.db_path)
         self._ensure_database_schema()
 
+        # Long-lived private connection shared by all methods: reusing it
+        # keeps SQLite's prepared statement cache warm across calls. Opened
+        # outside the pool because we put it in autocommit mode, and the
+        # pooled handle is shared with other callers on the thread. Access
+        # is serialized by _db_lock since process_files runs on worker
+        # threads.
+        self._conn = database.open_connection(
+            str(self.db_path), check_same_thread=False
+        )
+        self._conn.isolation_level = None
+        self._db_lock = threading.Lock()
+        # Lazily-opened per-thread connections for read paths: WAL supports
+        # concurrent readers, so stats/search need not queue on _db_lock
+        self._local = threading.local()
+        # (timestamp, stats) pair; repeated health probes within the TTL
+        # reuse it instead of re-counting three tables
+        self._stats_cache = (0.0, None)
+        # Cross-document (casefolded name -> id) LRU: recurring entities
+        # skip the existence SELECT and the upsert on later documents
+        self._id_cache: OrderedDict = OrderedDict()
+
+    def _get_read_conn(self):
+        """Return this thread's cached read connection, opening it lazily.
+
+        The handle is revalidated like database._pool does: it is the same
+        pooled object other callers receive, and the repo's get_connection()
+        ... conn.close() idiom elsewhere can close it under us.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            try:
+                conn.execute("SELECT 1")
+            except sqlite3.Error:
+                conn = None
+        if conn is None:
+            conn = database.get_connection(str(self.db_path))
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        """Close the processor's database connections."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        local_conn = getattr(self._local, "conn", None)
+        if local_conn is not None:
+            local_conn.close()
+            self._local.conn = None
+
     def _ensure_database_schema(self):
         """Ensure database schema is created."""
         try:
             conn = database.get_connection(str(self.db_path))
+            if (
+                conn.execute("PRAGMA user_version").fetchone()[0]
+                == _SCHEMA_VERSION
+            ):
+                # Schema already applied: skip the multi-KB executescript
+                # parse that every instantiation otherwise pays
+                logger.debug("Database schema up to date")
+                return
             with conn:
                 conn.executescript(database.SCHEMA_SQL)
+                # Hot-loop lookup indexes beyond the base schema: the
+                # case-insensitive composite serves name+type probes without
+                # the double-keyed entity_map normalization, and the relation
+                # pair index serves the duplicate-relation guard.
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_entities_name_type "
+                    "ON entities(name COLLATE NOCASE, entity_type)"
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_relations_from_to "
+                    "ON relations(from_entity_id, to_entity_id)"
+                )
+                # Uniqueness over the full triple backs the OR IGNORE in the
+                # relation insert; duplicates from before the constraint are
+                # collapsed first so index creation cannot fail
+                conn.execute(
+                    """DELETE FROM relations WHERE id NOT IN (
+                           SELECT MIN(id) FROM relations
+                           GROUP BY from_entity_id, to_entity_id, relation_type)"""
+                )
+                conn.execute(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS idx_relations_triple "
+                    "ON relations(from_entity_id, to_entity_id, relation_type)"
+                )
+                # Persisted LLM extraction results keyed by content hash, so
+                # reprocessing the same text skips the model call entirely
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS extraction_cache ("
+                    "hash TEXT PRIMARY KEY, result_json TEXT NOT NULL, "
+                    "created_at INTEGER)"
+                )
+                cache_cols = {
+                    row[1]
+                    for row in conn.execute("PRAGMA table_info(extraction_cache)")
+                }
+                if "created_at" not in cache_cols:
+                    conn.execute(
+                        "ALTER TABLE extraction_cache ADD COLUMN created_at INTEGER"
+                    )
+                self._ensure_search_index(conn)
+                # Duplicate-observation guard: hash column plus unique index
+                # lets repeated ingestion use INSERT OR IGNORE (NULL hashes
+                # on legacy rows stay distinct, so the index always applies)
+                obs_cols = {
+                    row[1] for row in conn.execute("PRAGMA table_info(observations)")
+                }
+                if "content_hash" not in obs_cols:
+                    conn.execute(
+                        "ALTER TABLE observations ADD COLUMN content_hash BLOB"
+                    )
+                conn.execute(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS idx_observations_entity_hash "
+                    "ON observations(entity_id, content_hash)"
+                )
+                conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
             logger.info("Database schema verified")
-            print("Database schema verified")
         except Exception as e:
-            logger.error(f"Failed to create database schema: {e}")
-            print(f"Failed to create database schema: {e}")
+            logger.error("Failed to create database schema: %s", e)
             raise ContentProcessingError(f"Database schema error: {e}")
 
+    def _ensure_search_index(self, conn) -> None:
+        """Create the FTS5 index over entities and keep it trigger-synced.
+
+        LIKE '%q%' cannot use any B-tree index and scans the whole table;
+        the inverted index makes search O(log N). Silently skipped on
+        SQLite builds without FTS5 — search_entities falls back to LIKE.
+        """
+        try:
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS entities_fts USING fts5("
+                "name, description, content='entities', content_rowid='id')"
+            )
+            conn.executescript(
+                """
+                CREATE TRIGGER IF NOT EXISTS entities_fts_ai AFTER INSERT ON entities BEGIN
+                    INSERT INTO entities_fts(rowid, name, description)
+                    VALUES (new.id, new.name, new.description);
+                END;
+                CREATE TRIGGER IF NOT EXISTS entities_fts_ad AFTER DELETE ON entities BEGIN
+                    INSERT INTO entities_fts(entities_fts, rowid, name, description)
+                    VALUES ('delete', old.id, old.name, old.description);
+                END;
+                CREATE TRIGGER IF NOT EXISTS entities_fts_au AFTER UPDATE ON entities BEGIN
+                    INSERT INTO entities_fts(entities_fts, rowid, name, description)
+                    VALUES ('delete', old.id, old.name, old.description);
+                    INSERT INTO entities_fts(rowid, name, description)
+                    VALUES (new.id, new.name, new.description);
+                END;
+                """
+            )
+            # Backfill rows that predate the index (one-time cost)
+            fts_rows = conn.execute("SELECT count(*) FROM entities_fts").fetchone()[0]
+            entity_rows = conn.execute("SELECT count(*) FROM entities").fetchone()[0]
+            if fts_rows == 0 and entity_rows > 0:
+                conn.execute("INSERT INTO entities_fts(entities_fts) VALUES('rebuild')")
+        except sqlite3.OperationalError as e:
+            logger.warning("FTS5 unavailable, search will use LIKE scans: %s", e)
+
     def process_text(
         self, text: str, source_type: str = "text", source_path: Optional[str] = None
     ) -> Dict[str, Any]:
@@ -85,17 +413,10 @@ class ContentProcessor:
             }
 
         try:
-            # Extract entities and relations using LLM
-            logger.info(f"Processing {len(text)} characters of {source_type} content")
-            # Use the LLM client's `generate`/`extract_entities_relations` if available
-            extraction_result = self.llm_client.extract_entities_relations(
-                text, source_type, source_path
-            )
-            prompt = (
-                f"Extract entities and relations from the following text:\n\n{text}"
-            )
-            extraction_result = self.llm_client.generate(prompt)
-            
+            # Extract entities and relations using LLM (cache-aware)
+            logger.info("Processing %d characters of %s content", len(text), source_type)
+            extraction_result = self._cached_extraction(text, source_type, source_path)
+
             # Validate extraction result
             entities_data = extraction_result.get("entities", [])
             relations_data = extraction_result.get("relations", [])
@@ -116,19 +437,346 @@ class ContentProcessor:
             )
 
             logger.info(
-                f"Processing completed: {result.get('entities_created', 0)} entities, "
-                f"{result.get('relations_created', 0)} relations created"
+                "Processing completed: %d entities, %d relations created",
+                result.get("entities_created", 0),
+                result.get("relations_created", 0),
             )
 
             return result
 
         except LLMError as e:
-            logger.error(f"LLM extraction failed: {e}")
+            logger.error("LLM extraction failed: %s", e)
             raise ContentProcessingError(f"Entity extraction failed: {e}")
         except Exception as e:
-            logger.error(f"Content processing failed: {e}")
+            logger.error("Content processing failed: %s", e)
             raise ContentProcessingError(f"Processing error: {e}")
 
+    @property
+    def _batch_queue_path(self) -> Path:
+        """JSONL file holding documents enqueued for deferred processing."""
+        return self.db_path.with_name(self.db_path.stem + "_batch_queue.jsonl")
+
+    def enqueue_for_batch(
+        self, text: str, source_type: str = "text", source_path: Optional[str] = None
+    ) -> None:
+        """Queue a document for deferred batch ingestion.
+
+        The local LLM endpoint has no provider-side batch API, so deferral
+        is a local JSONL queue: enqueue is a cheap append, and
+        process_enqueued drains everything later (e.g. off-peak) through
+        the concurrent process_batch path.
+        """
+        record = {"text": text, "source_type": source_type, "source_path": source_path}
+        with open(self._batch_queue_path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def process_enqueued(self) -> Dict[str, Any]:
+        """Drain the pending batch queue through process_batch.
+
+        Documents are grouped by source_type so stored observations keep
+        their origin; the queue file is removed once every group stored.
+        """
+        queue_path = self._batch_queue_path
+        if not queue_path.exists():
+            return {"success": True, "documents_processed": 0}
+
+        with open(queue_path, encoding="utf-8") as fh:
+            records = [json.loads(line) for line in fh if line.strip()]
+        if not records:
+            queue_path.unlink()
+            return {"success": True, "documents_processed": 0}
+
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            groups.setdefault(record.get("source_type", "text"), []).append(record)
+
+        totals = {
+            "success": True,
+            "documents_processed": len(records),
+            "entities_created": 0,
+            "relations_created": 0,
+            "observations_created": 0,
+        }
+        for source_type, group in groups.items():
+            result = asyncio.run(
+                self.process_batch(
+                    [r["text"] for r in group],
+                    source_type=source_type,
+                    source_path=",".join(
+                        str(r.get("source_path") or "unknown") for r in group
+                    ),
+                )
+            )
+            for counter in (
+                "entities_created",
+                "relations_created",
+                "observations_created",
+            ):
+                totals[counter] += result.get(counter, 0)
+
+        queue_path.unlink()
+        return totals
+
+    def _cached_extraction(
+        self, text: str, source_type: str = "text", source_path: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Return the LLM extraction for text, reusing the persisted cache.
+
+        Extraction is deterministic for a given text/model pair, so repeat
+        ingestions (dev loops, retries, duplicate uploads) hit the cache at
+        a tiny fraction of the cost of an LLM call. The key covers text,
+        source_type and the configured model so a model swap or a different
+        prompt framing never serves stale results; blake2b is the fastest
+        keyed hash in hashlib and 16 bytes is plenty for cache addressing.
+        """
+        model = getattr(getattr(self.llm_client, "config", None), "model", "")
+        content_hash = hashlib.blake2b(
+            "|".join((model, source_type, text)).encode("utf-8"),
+            digest_size=16,
+        ).hexdigest()
+        with self._db_lock:
+            row = self._conn.execute(_SQL_CACHE_GET, (content_hash,)).fetchone()
+        if row is not None:
+            logger.debug("Extraction cache hit for %s", content_hash[:12])
+            return json.loads(row[0])
+
+        result = self._extract_with_retry(text, source_type, source_path)
+        # Only genuine LLM successes are persisted. Rule-based fallback
+        # output (marked degraded by the client) and the empty shape an
+        # unparseable response produces would otherwise permanently shadow
+        # a healthy re-extraction of the same text
+        if not result.get("degraded") and (
+            result.get("entities") or result.get("relations")
+        ):
+            with self._db_lock:
+                self._conn.execute(
+                    _SQL_CACHE_PUT,
+                    (content_hash, json.dumps(result), int(time.time())),
+                )
+        return result
+
+    def _extract_with_retry(
+        self, text: str, source_type: str = "text", source_path: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Call the LLM client for one extraction.
+
+        Transient-failure retry lives inside LLMClient (ahead of its
+        rule-based fallback); with the default client this call already
+        carries the backoff budget, so no second loop runs here.
+        """
+        return self.llm_client.extract_entities_relations(
+            text, source_type, source_path
+        )
+
+    async def _extract_async(
+        self,
+        text: str,
+        source_type: str = "text",
+        source_path: Optional[str] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> Dict[str, Any]:
+        """Run one LLM extraction off the event loop, bounded by the semaphore.
+
+        The semaphore must come from the caller so it belongs to the
+        running loop; see _LLM_CONCURRENCY.
+        """
+        if semaphore is None:
+            return await asyncio.to_thread(
+                self._extract_with_retry, text, source_type, source_path
+            )
+        async with semaphore:
+            return await asyncio.to_thread(
+                self._extract_with_retry, text, source_type, source_path
+            )
+
+    async def process_text_async(
+        self, text: str, source_type: str = "text", source_path: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Async counterpart of process_text for event-loop callers.
+
+        Large documents are split into paragraph-bounded chunks and fanned
+        out through process_batch, so N-chunk latency approaches one LLM
+        round-trip instead of N stacked ones.
+        """
+        chunks = _chunk_text(text)
+        if len(chunks) > 1:
+            return await self.process_batch(chunks, source_type, source_path)
+        return await asyncio.to_thread(self.process_text, text, source_type, source_path)
+
+    async def process_batch(
+        self,
+        texts: List[str],
+        source_type: str = "text",
+        source_path: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Process several texts concurrently and store the merged extraction.
+
+        LLM calls run via asyncio.gather (bounded by a per-call semaphore,
+        created here so it belongs to the running loop) so latency no longer
+        stacks per document; _store_results runs once over the merged
+        entities/relations, amortizing the database work too.
+        """
+        texts = [t for t in texts if t and t.strip()]
+        if not texts:
+            return {
+                "success": True,
+                "entities_created": 0,
+                "relations_created": 0,
+                "observations_created": 0,
+                "message": "Empty text, nothing to process",
+            }
+
+        semaphore = asyncio.Semaphore(_LLM_CONCURRENCY)
+        try:
+            extractions = await asyncio.gather(
+                *[
+                    self._extract_async(t, source_type, source_path, semaphore)
+                    for t in texts
+                ],
+                return_exceptions=True,
+            )
+
+            merged: Dict[str, Any] = {"entities": [], "relations": []}
+            failures = []
+            for extraction in extractions:
+                if isinstance(extraction, BaseException):
+                    # One failed chunk should not discard the others
+                    logger.warning("Chunk extraction failed: %s", extraction)
+                    failures.append(extraction)
+                    continue
+                merged["entities"].extend(extraction.get("entities", []))
+                merged["relations"].extend(extraction.get("relations", []))
+            if failures and len(failures) == len(extractions):
+                raise failures[0]
+
+            result = self._store_results(merged, source_type, source_path or "unknown")
+            result.update(
+                {
+                    "success": True,
+                    "total_entities": len(merged["entities"]),
+                    "total_relations": len(merged["relations"]),
+                    "source_type": source_type,
+                    "source_path": source_path,
+                }
+            )
+            return result
+
+        except LLMError as e:
+            logger.error("LLM extraction failed: %s", e)
+            raise ContentProcessingError(f"Entity extraction failed: {e}")
+        except Exception as e:
+            logger.error("Content processing failed: %s", e)
+            raise ContentProcessingError(f"Processing error: {e}")
+
+    async def process_many(
+        self,
+        docs: List[Dict[str, Any]],
+        llm_concurrency: int = 8,
+        db_concurrency: int = 1,
+    ) -> List[Dict[str, Any]]:
+        """Process documents concurrently with separate LLM and DB caps.
+
+        Each doc is a dict with text/source_type/source_path (the batch
+        queue record shape). Extraction runs under its own semaphore while
+        storage defaults to single-file — SQLite prefers one writer — so
+        LLM latency overlaps across documents without write contention.
+        Returns one _store_results dict per document, in input order.
+        """
+        llm_sem = asyncio.Semaphore(llm_concurrency)
+        db_sem = asyncio.Semaphore(db_concurrency)
+
+        async def one(doc: Dict[str, Any]) -> Dict[str, Any]:
+            source_type = doc.get("source_type", "text")
+            source_path = doc.get("source_path")
+            async with llm_sem:
+                extraction = await asyncio.to_thread(
+                    self._extract_with_retry,
+                    doc.get("text", ""),
+                    source_type,
+                    source_path,
+                )
+            async with db_sem:
+                return await asyncio.to_thread(
+                    self._store_results,
+                    extraction,
+                    source_type,
+                    source_path or "unknown",
+                )
+
+        return await asyncio.gather(*[one(doc) for doc in docs])
+
+    async def run_pipeline(
+        self,
+        texts: List[str],
+        source_type: str = "text",
+        source_path: Optional[str] = None,
+        extractors: int = 4,
+    ) -> Dict[str, Any]:
+        """Stream texts through an extraction→storage queue pipeline.
+
+        Unlike process_batch (which gathers every extraction before one
+        store), this overlaps the two stages: N extractor tasks pull from a
+        bounded queue while a single writer drains finished extractions into
+        _store_results, keeping SQLite single-writer. Throughput approaches
+        max(LLM rate, DB rate) instead of their sum of latencies, and the
+        bounded queues cap memory for arbitrarily long inputs.
+        """
+        extract_q: asyncio.Queue = asyncio.Queue(maxsize=32)
+        store_q: asyncio.Queue = asyncio.Queue(maxsize=32)
+        totals = {
+            "success": True,
+            "documents_processed": 0,
+            "entities_created": 0,
+            "relations_created": 0,
+            "observations_created": 0,
+        }
+
+        async def feeder():
+            for text in texts:
+                if text and text.strip():
+                    await extract_q.put(text)
+            for _ in range(extractors):
+                await extract_q.put(None)
+
+        async def extractor():
+            while True:
+                chunk = await extract_q.get()
+                if chunk is None:
+                    await store_q.put(None)
+                    return
+                try:
+                    await store_q.put(
+                        await self._extract_async(chunk, source_type, source_path)
+                    )
+                except Exception as e:
+                    logger.warning("Pipeline extraction failed: %s", e)
+
+        async def writer():
+            finished = 0
+            while finished < extractors:
+                extraction = await store_q.get()
+                if extraction is None:
+                    finished += 1
+                    continue
+                result = await asyncio.to_thread(
+                    self._store_results,
+                    extraction,
+                    source_type,
+                    source_path or "unknown",
+                )
+                totals["documents_processed"] += 1
+                for counter in (
+                    "entities_created",
+                    "relations_created",
+                    "observations_created",
+                ):
+                    totals[counter] += result.get(counter, 0)
+
+        await asyncio.gather(
+            feeder(), *[extractor() for _ in range(extractors)], writer()
+        )
+        return totals
+
     def _store_results(
         self,
         llm_result: Dict[str, Any],
@@ -142,133 +790,188 @@ class ContentProcessor:
         create missing entities referenced by relations.
         """
 
-        # Add explicit print statements for debugging (kept lightweight)
-        print("=== _store_results method called ===")
-        print(f"llm_result keys: {list(llm_result.keys()) if llm_result else 'None'}")
-        print(f"source_type: {source_type}")
-        print(f"source_path: {source_path}")
-
-        logger.info("Starting to store results in the database")
-        logger.info(f"Database path: {self.db_path}")
+        if logger.isEnabledFor(logging.DEBUG):
+            # Guarded so the key listing is not built when DEBUG is off
+            logger.debug(
+                "_store_results called: keys=%s source_type=%s source_path=%s",
+                list(llm_result.keys()) if llm_result else None,
+                source_type,
+                source_path,
+            )
 
         entities_created = 0
         entities_existing = 0
         relations_created = 0
         observations_created = 0
 
+        # One BEGIN IMMEDIATE/COMMIT pair around the whole batch instead of
+        # per-statement autocommit, on the shared long-lived connection.
+        conn = self._conn
+        self._db_lock.acquire()
         try:
-            conn = database.get_connection(str(self.db_path))
-
-            # Process entities
+            conn.execute("BEGIN IMMEDIATE")
+            # Process entities in bulk: one INSERT OR IGNORE batch plus a
+            # single SELECT to resolve ids, instead of 2N round-trips.
             entity_map = {}
             entities_data = llm_result.get("entities", [])
 
+            # Single pass over the extraction, deduplicated by casefolded
+            # name: multi-chunk extractions repeat entities often, and
+            # distinct descriptions of the same entity are merged instead of
+            # issuing redundant insert traffic
+            unique_entities: Dict[str, List[str]] = {}
             for entity_data in entities_data:
                 entity_name = (entity_data.get("name") or "").strip()
                 if not entity_name:
                     continue
+                description = (entity_data.get("description") or "").strip()
+                k = _key(entity_name)
+                existing = unique_entities.get(k)
+                if existing is None:
+                    unique_entities[k] = [
+                        entity_name,
+                        entity_data.get("type", "conceito"),
+                        description,
+                    ]
+                elif description and description not in existing[2]:
+                    existing[2] = (
+                        f"{existing[2]} | {description}" if existing[2] else description
+                    )
 
-                entity_type = entity_data.get("type", "conceito")
-
-                # Check if entity already exists in DB
-                existing = conn.execute(
-                    "SELECT id FROM entities WHERE name = ? AND entity_type = ?",
-                    (entity_name, entity_type),
-                ).fetchone()
-
-                if existing:
-                    entity_id = existing[0]
+            all_rows = [tuple(v) for v in unique_entities.values()]
+            # A description that merely repeats the entity name adds no
+            # information and is not worth an observation row
+            pending_obs = [
+                (k, v[2]) for k, v in unique_entities.items() if v[2] and v[2] != v[0]
+            ]
+
+            # Names resolved in a previous document skip the database
+            # entirely; only unknown ones go through SELECT + upsert
+            entity_rows = []
+            for row in all_rows:
+                cached_id = self._id_cache.get(_key(row[0]))
+                if cached_id is not None:
+                    self._id_cache.move_to_end(_key(row[0]))
+                    entity_map[_key(row[0])] = cached_id
                     entities_existing += 1
                 else:
-                    entity_id = database.add_entity(
-                        conn,
-                        name=entity_name,
-                        entity_type=entity_type,
-                        description=entity_data.get("description", ""),
+                    entity_rows.append(row)
+
+            if entity_rows:
+                names = [row[0] for row in entity_rows]
+                existing_names = {
+                    row[0]
+                    for row in _select_by_names(
+                        conn, "SELECT name FROM entities WHERE name IN ({})", names
                     )
-                    entities_created += 1
-
-                # store in map for relation resolution
-                entity_map[entity_name] = entity_id
-                entity_map[entity_name.lower().strip()] = entity_id
-
-                # Add observation when description present
-                description = (entity_data.get("description") or "").strip()
-                if description:
-                    database.add_observation(
-                        conn,
-                        entity_id=entity_id,
-                        content=description,
-                        source_type=source_type,
-                        source_path=source_path,
+                }
+                entities_existing += len(existing_names)
+                entities_created = len(names) - len(existing_names)
+
+                if _SUPPORTS_RETURNING:
+                    # One statement both upserts and returns the ids; the
+                    # no-op DO UPDATE forces every row into the RETURNING set
+                    entities_json = json.dumps(
+                        [
+                            {"name": name, "type": etype, "description": desc}
+                            for name, etype, desc in entity_rows
+                        ]
                     )
-                    observations_created += 1
-
-            # Helper to find an entity id in the current map
-            def find_entity_id(name: str) -> Optional[int]:
-                if not name:
-                    return None
-                if name in entity_map:
-                    return entity_map[name]
-                norm = name.lower().strip()
-                return entity_map.get(norm)
-
-            # Helper to create missing entities referenced in relations
-            def create_missing_entity(name: str) -> int:
-                # Try to find in DB first
-                existing_row = conn.execute(
-                    "SELECT id FROM entities WHERE name = ? AND entity_type = ?",
-                    (name, "conceito"),
-                ).fetchone()
-                if existing_row:
-                    eid = existing_row[0]
+                    id_rows = conn.execute(
+                        _SQL_UPSERT_ENTITIES_RETURNING, (entities_json,)
+                    ).fetchall()
                 else:
-                    eid = database.add_entity(
-                        conn,
-                        name=name,
-                        entity_type="conceito",
-                        description="Entidade criada automaticamente a partir de relação",
+                    for batch in _iter_batches(entity_rows, _BATCH_ROWS):
+                        conn.executemany(_SQL_INSERT_ENTITY_IGNORE, batch)
+                    # Resolve all ids, batched, to build the relation map
+                    id_rows = _select_by_names(
+                        conn, "SELECT id, name FROM entities WHERE name IN ({})", names
                     )
-                    # increment created
-                    nonlocal entities_created
-                    entities_created += 1
-
-                entity_map[name] = eid
-                entity_map[name.lower().strip()] = eid
-                return eid
 
-            # Process relations
+                for entity_id, entity_name in id_rows:
+                    k = _key(entity_name)
+                    entity_map[k] = entity_id
+                    self._id_cache[k] = entity_id
+                    self._id_cache.move_to_end(k)
+                while len(self._id_cache) > _ID_CACHE_MAX:
+                    self._id_cache.popitem(last=False)
+
+            # Add observations when descriptions are present, as one batch;
+            # the blake2b content hash + unique index drops texts already
+            # stored for the same entity in earlier runs
+            obs_rows = [
+                (
+                    entity_map[key],
+                    description,
+                    source_type,
+                    source_path,
+                    hashlib.blake2b(description.encode(), digest_size=16).digest(),
+                )
+                for key, description in pending_obs
+                if key in entity_map
+            ]
+            if obs_rows:
+                for batch in _iter_batches(obs_rows, _BATCH_ROWS):
+                    cursor = conn.executemany(_SQL_INSERT_OBSERVATIONS, batch)
+                    observations_created += cursor.rowcount
+
+            # Process relations fully in SQL: json_each resolves the from/to
+            # names against entities by name, so no Python-side id map or
+            # per-relation lookup is needed.
             relations_data = llm_result.get("relations", [])
-            for relation in relations_data:
-                frm = (relation.get("from") or "").strip()
-                to = (relation.get("to") or "").strip()
-                if not frm or not to:
-                    continue
+            if relations_data:
+                # Dedupe by (from, to, type) before serializing: chunked
+                # extractions commonly repeat the same relation. Endpoint
+                # names are normalized to one casing per casefolded key —
+                # the extracted entity's spelling when there is one — so the
+                # SQL below never sees two case variants of the same name
+                canonical = {k: v[0] for k, v in unique_entities.items()}
+                seen = set()
+                deduped_relations = []
+                for relation in relations_data:
+                    from_name = (relation.get("from") or "").strip()
+                    to_name = (relation.get("to") or "").strip()
+                    from_name = canonical.setdefault(_key(from_name), from_name)
+                    to_name = canonical.setdefault(_key(to_name), to_name)
+                    signature = (
+                        from_name.casefold(),
+                        to_name.casefold(),
+                        relation.get("type", "relacionado_a"),
+                    )
+                    if signature in seen:
+                        continue
+                    seen.add(signature)
+                    deduped_relations.append(
+                        {**relation, "from": from_name, "to": to_name}
+                    )
+                relations_json = json.dumps(deduped_relations)
 
-                from_id = find_entity_id(frm)
-                if from_id is None:
-                    from_id = create_missing_entity(frm)
-
-                to_id = find_entity_id(to)
-                if to_id is None:
-                    to_id = create_missing_entity(to)
-
-                database.add_relation(
-                    conn,
-                    from_entity_id=from_id,
-                    to_entity_id=to_id,
-                    relation_type=relation.get("type", "relacionado_a"),
-                    evidence=relation.get("evidence", ""),
-                    strength=float(relation.get("strength", 1.0)),
+                # Create any entities referenced only by relations. rowcount
+                # is sqlite3_changes for this statement alone; total_changes
+                # deltas would also count the FTS trigger shadow writes
+                cursor = conn.execute(
+                    _SQL_INSERT_RELATION_ENDPOINTS, (relations_json, relations_json)
                 )
-                relations_created += 1
+                entities_created += cursor.rowcount
+
+                cursor = conn.execute(_SQL_INSERT_RELATIONS, (relations_json,))
+                relations_created = cursor.rowcount
 
-            conn.commit()
-            conn.close()
+            conn.execute("COMMIT")
 
         except Exception as e:
-            logger.exception(f"Error storing results: {e}")
+            # BEGIN IMMEDIATE itself may have failed (e.g. a concurrent
+            # writer holding the lock), in which case there is nothing to
+            # roll back.
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            logger.exception("Error storing results: %s", e)
             raise
+        finally:
+            self._db_lock.release()
+
+        # Counts changed: the next stats call must recompute
+        self._stats_cache = (0.0, None)
 
         result = {
             "entities_created": entities_created,
@@ -277,66 +980,94 @@ class ContentProcessor:
             "observations_created": observations_created,
         }
 
-        print("=== _store_results completed ===")
-        print(f"Result: {result}")
+        logger.debug("_store_results completed: %s", result)
 
         return result
 
+    _STATS_TTL = 30.0
+
     def get_entity_stats(self) -> Dict[str, Any]:
-        """Get statistics about entities in the database."""
-        try:
-            conn = database.get_connection(str(self.db_path))
-            with conn:
-                # Count entities by type
-                entity_stats = conn.execute(
-                    "SELECT entity_type, COUNT(*) FROM entities GROUP BY entity_type"
-                ).fetchall()
+        """Get statistics about entities in the database.
 
-                # Count total relations
-                total_relations = conn.execute(
-                    "SELECT COUNT(*) FROM relations"
-                ).fetchone()[0]
-
-                # Count total observations
-                total_observations = conn.execute(
-                    "SELECT COUNT(*) FROM observations"
-                ).fetchone()[0]
-
-                return {
-                    "total_entities": sum(count for _, count in entity_stats),
-                    "entity_types": dict(entity_stats),
-                    "total_relations": total_relations,
-                    "total_observations": total_observations,
-                }
+        Results are cached for _STATS_TTL seconds; _store_results drops the
+        cache after every successful write, so staleness is bounded to pure
+        read-only windows.
+        """
+        cached_at, cached = self._stats_cache
+        if cached is not None and time.monotonic() - cached_at < self._STATS_TTL:
+            return cached
+        try:
+            conn = self._get_read_conn()
+            # Count entities by type
+            entity_stats = conn.execute(
+                "SELECT entity_type, COUNT(*) FROM entities GROUP BY entity_type"
+            ).fetchall()
+
+            # Both totals in one statement: COUNT(*) on each table is an
+            # O(1) B-tree metadata read, so the cost here is per-query
+            # dispatch, not the counting
+            total_relations, total_observations = conn.execute(
+                "SELECT (SELECT COUNT(*) FROM relations),"
+                " (SELECT COUNT(*) FROM observations)"
+            ).fetchone()
+
+            stats = {
+                "total_entities": sum(count for _, count in entity_stats),
+                "entity_types": dict(entity_stats),
+                "total_relations": total_relations,
+                "total_observations": total_observations,
+            }
+            self._stats_cache = (time.monotonic(), stats)
+            return stats
         except Exception as e:
-            logger.error(f"Failed to get entity stats: {e}")
+            logger.error("Failed to get entity stats: %s", e)
             return {}
 
     def search_entities(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Search entities by name or description."""
         try:
-            conn = database.get_connection(str(self.db_path))
-            with conn:
+            conn = self._get_read_conn()
+            try:
+                # Quote each term so user input cannot inject MATCH
+                # syntax; the trailing * keeps prefix matches working
+                # (e.g. "phil" finds "philosopher")
+                fts_query = " ".join(
+                    '"{}"*'.format(term.replace('"', '""'))
+                    for term in query.split()
+                )
+                # Join on rowid and order by FTS rank (bm25) so the most
+                # relevant entities surface first instead of alphabetical
                 results = conn.execute(
-                    """SELECT id, name, entity_type, description 
-                       FROM entities 
+                    """SELECT e.id, e.name, e.entity_type, e.description
+                       FROM entities_fts f
+                       JOIN entities e ON e.id = f.rowid
+                       WHERE entities_fts MATCH ?
+                       ORDER BY rank
+                       LIMIT ?""",
+                    (fts_query, limit),
+                ).fetchall()
+            except sqlite3.OperationalError:
+                # FTS5 missing or unusable query: fall back to the scan
+                results = conn.execute(
+                    """SELECT id, name, entity_type, description
+                       FROM entities
                        WHERE name LIKE ? OR description LIKE ?
                        ORDER BY name
                        LIMIT ?""",
                     (f"%{query}%", f"%{query}%", limit),
                 ).fetchall()
 
-                return [
-                    {
-                        "id": row[0],
-                        "name": row[1],
-                        "type": row[2],
-                        "description": row[3],
-                    }
-                    for row in results
-                ]
+            return [
+                {
+                    "id": row[0],
+                    "name": row[1],
+                    "type": row[2],
+                    "description": row[3],
+                }
+                for row in results
+            ]
         except Exception as e:
-            logger.error(f"Entity search failed: {e}")
+            logger.error("Entity search failed: %s", e)
             return []
 
     def health_check(self) -> Dict[str, Any]:
@@ -363,59 +1094,49 @@ class ContentProcessor:
 
         return status
 
+    def _extract_text(self, f: Path) -> List[str]:
+        """Extract text from one uploaded file as page-sized chunks.
+
+        The handler is resolved from the module dispatch table by suffix;
+        PDFs split on the form feed pdftotext emits between pages, other
+        sources yield a single chunk. Returns an empty list when extraction
+        is unavailable for the file.
+        """
+        handler = _FILE_HANDLERS.get(f.suffix.lower(), _read_text_file)
+        try:
+            return handler(f)
+        except Exception as e:
+            logger.warning("Failed processing file %s: %s", f, e)
+            return []
+
     def process_files(self, files: List[Path], source: str = "files") -> Dict[str, Any]:
         """Process uploaded files: images (OCR), PDFs (pdftotext), or others.
 
+        Extraction runs per-file on a thread pool: tesseract/pdftotext are
+        blocking external processes, so independent files overlap cleanly.
+        The page chunks then go through process_batch, so LLM extraction is
+        parallel per page and no document-sized string is ever materialized.
+
         Args:
             files: List of Path objects pointing to saved uploaded files
             source: source label to store in DB
 
         Returns:
-            result dict from process_text
+            result dict from process_batch
         """
-        import subprocess
-
-        aggregated_text = []
-
-        for f in files:
-            suffix = f.suffix.lower()
-            try:
-                if suffix in {".png", ".jpg", ".jpeg", ".tiff", ".bmp"}:
-                    # Try tesseract
-                    try:
-                        out_txt = f.with_suffix("")
-                        subprocess.run(["tesseract", str(f), str(out_txt)], check=True)
-                        txt_path = out_txt.with_suffix(".txt")
-                        if txt_path.exists():
-                            aggregated_text.append(txt_path.read_text(encoding="utf-8"))
-                    except Exception:
-                        # fallback placeholder
-                        aggregated_text.append(f"[image:{f.name}]")
-
-                elif suffix == ".pdf":
-                    # pdftotext
-                    try:
-                        out_txt = f.with_suffix(".txt")
-                        subprocess.run(["pdftotext", str(f), str(out_txt)], check=True)
-                        if out_txt.exists():
-                            aggregated_text.append(out_txt.read_text(encoding="utf-8"))
-                    except Exception:
-                        # skip if not available
-                        logger.warning("pdftotext not available or failed for %s", f)
-                        continue
-                else:
-                    # Unknown file types: try to read as text
-                    try:
-                        aggregated_text.append(f.read_text(encoding="utf-8"))
-                    except Exception:
-                        aggregated_text.append(f"[file:{f.name}]")
-
-            except Exception as e:
-                logger.warning(f"Failed processing file {f}: {e}")
-
-        full_text = "\n\n".join(aggregated_text)
-        return self.process_text(
-            full_text, source_type=source, source_path=",".join([str(p) for p in files])
+        chunks: List[str] = []
+        if files:
+            with ThreadPoolExecutor(max_workers=min(8, len(files))) as executor:
+                # executor.map preserves input order
+                for file_chunks in executor.map(self._extract_text, files):
+                    chunks.extend(file_chunks)
+
+        return asyncio.run(
+            self.process_batch(
+                chunks,
+                source_type=source,
+                source_path=",".join([str(p) for p in files]),
+            )
         )
 
     def process_video(self, video_path: Path, source: str = "video") -> Dict[str, Any]:
@@ -442,7 +1163,7 @@ class ContentProcessor:
                     check=True,
                 )
             except Exception as e:
-                logger.error(f"Video processing failed: {e}")
+                logger.error("Video processing failed: %s", e)
                 raise ContentProcessingError(f"Video processing failed: {e}")
 
             # Find produced txt file
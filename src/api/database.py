@@ -1,11 +1,21 @@
 """
 Database schema and connection for Muleta Cognitiva MCP server.
+
+Connections run in WAL mode: readers and the writer no longer block each
+other, at the cost of slightly slower individual reads (the WAL must be
+consulted on each page fetch) and an extra -wal/-shm file pair next to
+the database.
 """
 
 import os
 import sqlite3
+import threading
 from pathlib import Path
 
+# INSERT ... RETURNING needs SQLite 3.35; older builds fall back to the
+# check-then-insert helpers below
+_SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
 # Allow overriding DB path via environment for tests/deployments
 DB_PATH = Path(os.environ.get("MULETA_DB_PATH", Path(__file__).parent / "muleta.db"))
 
@@ -147,11 +157,20 @@ CREATE TABLE IF NOT EXISTS knowledge_gaps (
 );
 
 -- Índices para performance
+-- (entities.name já é UNIQUE, então lookups por nome usam o índice
+--  automático da constraint; um índice extra em name só duplicaria ele)
 CREATE INDEX IF NOT EXISTS idx_entities_type ON entities(entity_type);
-CREATE INDEX IF NOT EXISTS idx_entities_name ON entities(name);
+DROP INDEX IF EXISTS idx_entities_name;
 CREATE INDEX IF NOT EXISTS idx_observations_entity ON observations(entity_id);
 CREATE INDEX IF NOT EXISTS idx_relations_from ON relations(from_entity_id);
 CREATE INDEX IF NOT EXISTS idx_relations_to ON relations(to_entity_id);
+-- Colapsa triplas duplicadas antes do índice único (no-op em bancos novos)
+DELETE FROM relations WHERE id NOT IN (
+    SELECT MIN(id) FROM relations
+    GROUP BY from_entity_id, to_entity_id, relation_type
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_relations_triple
+    ON relations(from_entity_id, to_entity_id, relation_type);
 CREATE INDEX IF NOT EXISTS idx_cards_entity ON spaced_repetition_cards(entity_id);
 CREATE INDEX IF NOT EXISTS idx_cards_next_review ON spaced_repetition_cards(next_review);
 CREATE INDEX IF NOT EXISTS idx_reviews_card ON card_reviews(card_id);
@@ -161,21 +180,97 @@ CREATE INDEX IF NOT EXISTS idx_assessment_questions_assessment ON assessment_que
 """
 
 
-def get_connection(db_path=DB_PATH):
+# Per-thread connection pool keyed on (db_path, check_same_thread). Reusing
+# the handle skips sqlite3_open, the WAL handshake and the PRAGMA round on
+# every call, which dominate short OLTP-style calls. Thread-local storage
+# keeps the sqlite3 same-thread rule intact without any locking.
+_pool = threading.local()
+
+
+def _pool_conns():
+    conns = getattr(_pool, "conns", None)
+    if conns is None:
+        conns = _pool.conns = {}
+    return conns
+
+
+def close_all():
+    """Close every pooled connection owned by the calling thread.
+
+    Mainly for tests that swap database files between cases; production
+    code can simply let pooled handles live for the thread's lifetime.
+    """
+    conns = _pool_conns()
+    for conn in conns.values():
+        try:
+            conn.close()
+        except Exception:
+            pass
+    conns.clear()
+
+
+def open_connection(db_path=DB_PATH, check_same_thread=True):
+    """Open a new configured connection, bypassing the per-thread pool.
+
+    For callers that own their handle outright (long-lived processor
+    connections, tests): the pool hands the same object to everyone on the
+    thread, so private state like isolation_level must not be set on it.
+    """
     # Create connection with sensible defaults for migrations and integrity
-    conn = sqlite3.connect(str(db_path), timeout=30)
+    # cached_statements keeps prepared VDBE programs alive across calls;
+    # check_same_thread=False lets callers share one handle across threads
+    # as long as they serialize access themselves
+    conn = sqlite3.connect(
+        str(db_path),
+        timeout=30,
+        cached_statements=256,
+        check_same_thread=check_same_thread,
+    )
     conn.row_factory = sqlite3.Row
-    # PRAGMAs: enforce foreign keys and use WAL for better concurrency
+    # PRAGMAs: enforce foreign keys, use WAL for better concurrency, and
+    # tune cache/temp storage so bulk writes are bandwidth- not fsync-bound
     try:
         conn.execute("PRAGMA foreign_keys = ON")
-        conn.execute("PRAGMA journal_mode = WAL")
-        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA cache_size = -65536")
+        if str(db_path) != ":memory:":
+            # Journal, checkpoint and mmap tuning only mean anything for a
+            # file-backed database; in-memory connections skip the round
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA mmap_size = 268435456")
+            # Writers spin for up to 30s on a locked database instead of
+            # surfacing SQLITE_BUSY; checkpoint the WAL every ~1000 pages so
+            # it cannot grow without bound under sustained writes
+            conn.execute("PRAGMA busy_timeout = 30000")
+            conn.execute("PRAGMA wal_autocheckpoint = 1000")
     except Exception:
         # Some SQLite builds or paths may not support these; ignore failures
         pass
     return conn
 
 
+def get_connection(db_path=DB_PATH, check_same_thread=True):
+    # Reuse the calling thread's pooled handle when one is still usable.
+    # ":memory:" is excluded: each connection there is a distinct database,
+    # and pooling would silently share state between unrelated callers.
+    key = (str(db_path), check_same_thread)
+    if key[0] != ":memory:":
+        pooled = _pool_conns().get(key)
+        if pooled is not None:
+            try:
+                pooled.execute("SELECT 1")
+                return pooled
+            except sqlite3.Error:
+                # Closed or broken by the previous user; drop and reopen
+                _pool_conns().pop(key, None)
+
+    conn = open_connection(db_path, check_same_thread)
+    if key[0] != ":memory:":
+        _pool_conns()[key] = conn
+    return conn
+
+
 def init_db(db_path=DB_PATH):
     """Initialize the database using the migration runner.
 
@@ -187,17 +282,136 @@ def init_db(db_path=DB_PATH):
     try:
         from . import migrations as migration_runner
     except Exception:
-        # fall back to executing SCHEMA_SQL if migration runner is unavailable
+        # fall back to executing SCHEMA_SQL if migration runner is unavailable.
+        # Deferring FK checks lets the script's sqlite_master writes batch
+        # without constraint probes between the CREATE statements; the
+        # pragma resets itself at commit. The pooled connection stays open
+        # for the calling thread's next use.
         conn = get_connection(db_path)
         with conn:
+            conn.execute("PRAGMA defer_foreign_keys = ON")
             conn.executescript(SCHEMA_SQL)
-        conn.close()
         return
 
     # Ensure migrations are applied to the chosen DB path
     migration_runner.apply_migrations(db_path=Path(db_path))
 
 
+# One writer at a time: WAL allows any number of concurrent readers, but
+# SQLite still serializes writers internally via SQLITE_BUSY retries.
+# Serializing at the app layer with a mutex is cheaper and also closes the
+# check-then-insert races in the helpers below.
+_writer_lock = threading.Lock()
+_writer_conns = {}
+_writer_guard = threading.Lock()
+
+
+def attach_shard(conn, alias, path):
+    """ATTACH another database file to conn under the given alias.
+
+    Lets write-heavy tables (e.g. raw observations per source_type) live
+    in their own file with its own WAL while entities/relations stay on
+    the main database, so cross-table joins keep working via the alias.
+    """
+    if not alias.isidentifier():
+        raise ValueError(f"invalid shard alias: {alias!r}")
+    conn.execute(f"ATTACH DATABASE ? AS {alias}", (str(path),))
+
+
+def get_writer(db_path=DB_PATH):
+    """Return the shared writer connection for db_path.
+
+    One handle per database, usable from any thread as long as writes are
+    wrapped in _writer_lock (the add_* helpers below do this themselves).
+    """
+    key = str(db_path)
+    with _writer_guard:
+        conn = _writer_conns.get(key)
+        if conn is not None:
+            try:
+                conn.execute("SELECT 1")
+                return conn
+            except sqlite3.Error:
+                _writer_conns.pop(key, None)
+        conn = _writer_conns[key] = get_connection(
+            db_path, check_same_thread=False
+        )
+        return conn
+
+
+def get_reader(db_path=DB_PATH):
+    """Return the calling thread's reader connection for db_path.
+
+    Readers run concurrently against the WAL snapshot, so each thread can
+    simply use its pooled handle from get_connection.
+    """
+    return get_connection(db_path)
+
+
+def find_entity_by_name(conn, name):
+    """Look up an entity row by name on a reader connection."""
+    return conn.execute(
+        "SELECT id, name, entity_type, description FROM entities WHERE name = ?",
+        (name,),
+    ).fetchone()
+
+
+# Helper SQL hoisted to module constants: the stable string identity lets
+# the connection's prepared-statement cache (cached_statements above) reuse
+# the compiled program instead of reparsing per call
+_SQL_SELECT_ENTITY_ID = "SELECT id FROM entities WHERE name = ? AND entity_type = ?"
+_SQL_UPDATE_ENTITY_DESC = (
+    "UPDATE entities SET description = ?, updated_at = CURRENT_TIMESTAMP "
+    "WHERE id = ? AND (description IS NULL OR description = '')"
+)
+_SQL_INSERT_ENTITY = """INSERT INTO entities (name, entity_type, description, created_at, updated_at)
+           VALUES (?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"""
+_SQL_INSERT_OBSERVATION = """INSERT INTO observations (entity_id, content, source_type, source_path, confidence, created_at)
+           VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)"""
+_SQL_SELECT_RELATION_ID = """SELECT id FROM relations
+           WHERE from_entity_id = ? AND to_entity_id = ? AND relation_type = ?"""
+_SQL_UPDATE_RELATION = """UPDATE relations
+                   SET evidence = ?, strength = ?
+                   WHERE id = ?"""
+_SQL_INSERT_RELATION = """INSERT INTO relations (from_entity_id, to_entity_id, relation_type, evidence, strength, created_at)
+           VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)"""
+
+# Single-statement UPSERTs: one VDBE program and one B-tree probe instead
+# of SELECT + conditional UPDATE/INSERT, and atomic without app locking.
+# The CASE expressions preserve the old helpers' semantics (only fill an
+# empty description / only overwrite evidence when a new one is given)
+# while still producing a RETURNING row on every call.
+_SQL_UPSERT_ENTITY_RETURNING = """INSERT INTO entities
+        (name, entity_type, description, created_at, updated_at)
+    VALUES (?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+    ON CONFLICT(name) DO UPDATE SET
+        description = CASE
+            WHEN trim(excluded.description) <> ''
+                 AND (entities.description IS NULL OR entities.description = '')
+            THEN excluded.description ELSE entities.description END,
+        updated_at = CASE
+            WHEN trim(excluded.description) <> ''
+                 AND (entities.description IS NULL OR entities.description = '')
+            THEN CURRENT_TIMESTAMP ELSE entities.updated_at END
+    RETURNING id"""
+
+# executemany cannot consume RETURNING rows, so the bulk helpers use the
+# same UPSERTs without it and re-resolve ids with one batched SELECT
+_SQL_UPSERT_ENTITY_BULK = _SQL_UPSERT_ENTITY_RETURNING[: _SQL_UPSERT_ENTITY_RETURNING.rfind("RETURNING")].rstrip()
+
+_SQL_UPSERT_RELATION_RETURNING = """INSERT INTO relations
+        (from_entity_id, to_entity_id, relation_type, evidence, strength, created_at)
+    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(from_entity_id, to_entity_id, relation_type) DO UPDATE SET
+        evidence = CASE WHEN trim(excluded.evidence) <> ''
+            THEN excluded.evidence ELSE relations.evidence END,
+        strength = CASE WHEN trim(excluded.evidence) <> ''
+            THEN excluded.strength ELSE relations.strength END
+    RETURNING id"""
+
+_SQL_UPSERT_RELATION_BULK = _SQL_UPSERT_RELATION_RETURNING[: _SQL_UPSERT_RELATION_RETURNING.rfind("RETURNING")].rstrip()
+
+
 def add_entity(conn, name: str, entity_type: str, description: str = "") -> int:
     """Add an entity to the database and return its ID.
 
@@ -212,30 +426,29 @@ def add_entity(conn, name: str, entity_type: str, description: str = "") -> int:
     """
     cursor = conn.cursor()
 
-    # Check if entity already exists
-    cursor.execute(
-        "SELECT id FROM entities WHERE name = ? AND entity_type = ?",
-        (name, entity_type),
-    )
-    existing = cursor.fetchone()
-
-    if existing:
-        # Update description if provided and current is empty
-        if description and description.strip():
+    if _SUPPORTS_RETURNING:
+        with _writer_lock:
             cursor.execute(
-                "UPDATE entities SET description = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ? AND (description IS NULL OR description = '')",
-                (description, existing[0]),
+                _SQL_UPSERT_ENTITY_RETURNING, (name, entity_type, description)
             )
-        return existing[0]
+            return cursor.fetchone()[0]
 
-    # Insert new entity
-    cursor.execute(
-        """INSERT INTO entities (name, entity_type, description, created_at, updated_at)
-           VALUES (?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)""",
-        (name, entity_type, description),
-    )
+    # Older SQLite: the whole check-then-insert runs under the writer mutex
+    # so two threads cannot both miss the SELECT and insert the same entity
+    with _writer_lock:
+        cursor.execute(_SQL_SELECT_ENTITY_ID, (name, entity_type))
+        existing = cursor.fetchone()
+
+        if existing:
+            # Update description if provided and current is empty
+            if description and description.strip():
+                cursor.execute(_SQL_UPDATE_ENTITY_DESC, (description, existing[0]))
+            return existing[0]
+
+        # Insert new entity
+        cursor.execute(_SQL_INSERT_ENTITY, (name, entity_type, description))
 
-    return cursor.lastrowid
+        return cursor.lastrowid
 
 
 def add_observation(
@@ -261,13 +474,13 @@ def add_observation(
     """
     cursor = conn.cursor()
 
-    cursor.execute(
-        """INSERT INTO observations (entity_id, content, source_type, source_path, confidence, created_at)
-           VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)""",
-        (entity_id, content, source_type, source_path, confidence),
-    )
+    with _writer_lock:
+        cursor.execute(
+            _SQL_INSERT_OBSERVATION,
+            (entity_id, content, source_type, source_path, confidence),
+        )
 
-    return cursor.lastrowid
+        return cursor.lastrowid
 
 
 def add_relation(
@@ -293,33 +506,119 @@ def add_relation(
     """
     cursor = conn.cursor()
 
-    # Check if relation already exists
-    cursor.execute(
-        """SELECT id FROM relations 
-           WHERE from_entity_id = ? AND to_entity_id = ? AND relation_type = ?""",
-        (from_entity_id, to_entity_id, relation_type),
-    )
-    existing = cursor.fetchone()
-
-    if existing:
-        # Update evidence and strength if provided
-        if evidence and evidence.strip():
+    if _SUPPORTS_RETURNING:
+        with _writer_lock:
             cursor.execute(
-                """UPDATE relations 
-                   SET evidence = ?, strength = ? 
-                   WHERE id = ?""",
-                (evidence, strength, existing[0]),
+                _SQL_UPSERT_RELATION_RETURNING,
+                (from_entity_id, to_entity_id, relation_type, evidence, strength),
             )
-        return existing[0]
+            return cursor.fetchone()[0]
 
-    # Insert new relation
-    cursor.execute(
-        """INSERT INTO relations (from_entity_id, to_entity_id, relation_type, evidence, strength, created_at)
-           VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)""",
-        (from_entity_id, to_entity_id, relation_type, evidence, strength),
-    )
+    # Older SQLite: same TOCTOU guard as add_entity, check and insert atomically
+    with _writer_lock:
+        cursor.execute(
+            _SQL_SELECT_RELATION_ID, (from_entity_id, to_entity_id, relation_type)
+        )
+        existing = cursor.fetchone()
+
+        if existing:
+            # Update evidence and strength if provided
+            if evidence and evidence.strip():
+                cursor.execute(_SQL_UPDATE_RELATION, (evidence, strength, existing[0]))
+            return existing[0]
+
+        # Insert new relation
+        cursor.execute(
+            _SQL_INSERT_RELATION,
+            (from_entity_id, to_entity_id, relation_type, evidence, strength),
+        )
+
+        return cursor.lastrowid
+
+
+# Entity names per IN() query, kept under SQLite's 999-variable ceiling
+_MAX_VARS = 900
 
-    return cursor.lastrowid
+
+def add_entities_bulk(conn, entities) -> dict:
+    """Insert/merge many entities in one transaction; return {name: id}.
+
+    One explicit BEGIN IMMEDIATE and one fsync for the whole batch instead
+    of an implicit transaction per row; the UPSERT program is prepared once
+    by executemany. `entities` is a list of dicts with name/type/description
+    keys as produced by the extractors.
+    """
+    rows = [
+        (
+            e["name"],
+            e.get("type") or e.get("entity_type") or "conceito",
+            e.get("description", "") or "",
+        )
+        for e in entities
+        if e.get("name")
+    ]
+    if not rows:
+        return {}
+
+    # Explicit transaction control: `with conn:` depends on the handle's
+    # isolation_level, which callers may have set to autocommit
+    with _writer_lock:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(_SQL_UPSERT_ENTITY_BULK, rows)
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+    names = [row[0] for row in rows]
+    ids = {}
+    cursor = conn.cursor()
+    for start in range(0, len(names), _MAX_VARS):
+        batch = names[start:start + _MAX_VARS]
+        placeholders = ",".join("?" * len(batch))
+        cursor.execute(
+            f"SELECT id, name FROM entities WHERE name IN ({placeholders})", batch
+        )
+        for row in cursor.fetchall():
+            ids[row["name"]] = row["id"]
+    return ids
+
+
+def add_relations_bulk(conn, relations) -> int:
+    """Insert/merge many relations in one transaction; return rows written.
+
+    `relations` is a list of dicts with from_entity_id/to_entity_id/
+    relation_type and optional evidence/strength keys (resolve names to
+    ids first, e.g. via add_entities_bulk).
+    """
+    rows = [
+        (
+            r["from_entity_id"],
+            r["to_entity_id"],
+            r.get("relation_type") or r.get("type") or "relacionado_a",
+            r.get("evidence", "") or "",
+            r.get("strength", 1.0),
+        )
+        for r in relations
+        if r.get("from_entity_id") and r.get("to_entity_id")
+    ]
+    if not rows:
+        return 0
+
+    with _writer_lock:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.executemany(_SQL_UPSERT_RELATION_BULK, rows)
+            conn.execute("COMMIT")
+            # rowcount is sqlite3_changes summed over the batch; unlike a
+            # total_changes delta it excludes trigger-driven writes
+            return cursor.rowcount
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
 
 
 if __name__ == "__main__":
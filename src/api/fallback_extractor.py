@@ -0,0 +1,96 @@
+"""
+Rule-based fallback extractor used when the local LLM is unavailable.
+Pulls quoted phrases and capitalized words out of the text and links
+consecutive entities with a weak proximity relation.
+"""
+
+import re
+import string
+from itertools import pairwise
+from typing import Any, Dict
+
+# One alternation scans the text a single time: double-quoted phrases,
+# single-quoted phrases and capitalized words each land in a named group,
+# so there is no separate findall pass (and intermediate list) per pattern
+_TOKEN_RE = re.compile(
+    r'"(?P<dq>[^"]+)"'
+    r"|'(?P<sq>[^']+)'"
+    r"|\b(?P<cap>[A-Z][a-zA-ZÀ-ÿ][\w-]*)\b"
+)
+
+# Quote-only variant for texts with no uppercase letter at all (chat-style
+# notes, lowercased transcripts): skips the capitalized-word alternative
+_QUOTED_RE = re.compile(r'"(?P<dq>[^"]+)"' r"|'(?P<sq>[^']+)'")
+
+# Maps ASCII uppercase to a sentinel; a plain `in` test after translate is
+# a C-level scan, far cheaper than running the cap alternative everywhere
+_UPPER_TABLE = str.maketrans({c: "\x01" for c in string.ascii_uppercase})
+
+# Sentence starters and function words that the capitalized-word pattern
+# would otherwise promote to entities; built once at import, compared
+# against the casefolded candidate
+_COMMON_WORDS = frozenset(
+    {
+        # português
+        "um", "uma", "de", "da", "do", "das", "dos", "em", "no", "na",
+        "nos", "nas", "que", "com", "para", "por", "como", "mas", "ele",
+        "ela", "eles", "elas", "isso", "esse", "essa", "este", "esta",
+        "entre", "sobre", "quando", "onde", "porque", "também", "muito",
+        "mais", "menos", "sim", "não",
+        # english
+        "the", "this", "that", "these", "those", "with", "from", "and",
+        "for", "are", "was", "were", "has", "have", "had", "not", "but",
+        "all", "any", "can", "will", "when", "where", "what", "which",
+        "how", "why", "there", "here", "then", "than", "its", "also",
+    }
+)
+
+
+def extract_entities_relations_fallback(text: str) -> Dict[str, Any]:
+    """Extract entities and relations from text without an LLM.
+
+    Args:
+        text: Input text to process
+
+    Returns:
+        Dictionary with entities and relations in the same shape the LLM
+        extraction produces (name/type/description and from/to/type/evidence)
+    """
+    if not text or not text.strip():
+        return {"entities": [], "relations": []}
+
+    # Cheap prefilter: the cap pattern starts with [A-Z], so a text with
+    # no ASCII uppercase can use the smaller quote-only alternation
+    token_re = _TOKEN_RE if "\x01" in text.translate(_UPPER_TABLE) else _QUOTED_RE
+
+    entities = []
+    seen = set()
+    for match in token_re.finditer(text):
+        name = match.group(match.lastgroup).strip()
+        if len(name) <= 2:
+            continue
+        key = name.casefold()
+        if key in _COMMON_WORDS or key in seen:
+            continue
+        seen.add(key)
+        entities.append(
+            {
+                "name": name,
+                "type": "conceito",
+                "description": "Extraído automaticamente (fallback)",
+            }
+        )
+
+    # Weak heuristic: entities mentioned next to each other are related.
+    # pairwise iterates adjacent pairs in C without the entities[1:] copy
+    relations = [
+        {
+            "from": a["name"],
+            "to": b["name"],
+            "type": "relacionado_a",
+            "evidence": "Proximidade no texto",
+        }
+        for a, b in pairwise(entities)
+    ]
+
+    return {"entities": entities, "relations": relations}
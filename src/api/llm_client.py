@@ -3,20 +3,110 @@ Local LLM client for entity and relation extraction.
 Uses local LLM HTTP endpoint with fallback to rule-based extraction.
 """
 
+import asyncio
+import hashlib
 import json
 import logging
-from typing import Any, Dict, Optional, Type
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Type
+
+try:
+    # Same optional fast path as response_parser: fall back to stdlib json
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
 
 import httpx
 from pydantic import BaseModel
 
 from .config import LLMConfig
-from .prompts import build_extraction_prompt
+from .fallback_extractor import extract_entities_relations_fallback
+from .prompts import build_extraction_prompt, build_system_prompt, build_user_message
 from .response_parser import parse_llm_response
 from .schemas import ContentAnalysis
 
 logger = logging.getLogger(__name__)
 
+# Substrings identifying LLM failures worth retrying (throttling or
+# transient transport problems); anything else fails fast
+_RETRYABLE_MARKERS = (
+    "429",
+    "rate",
+    "quota",
+    "timeout",
+    "timed out",
+    "connection",
+    "temporarily",
+    "overloaded",
+    "502",
+    "503",
+)
+
+# JSON schemas memoized by model class: model_json_schema() re-runs
+# Pydantic's introspection on every call, and the result never changes
+_SCHEMA_CACHE: Dict[type, Dict[str, Any]] = {}
+
+
+def _schema_for(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Return the cached JSON schema for a Pydantic model class."""
+    schema = _SCHEMA_CACHE.get(model)
+    if schema is None:
+        schema = model.model_json_schema()
+        _SCHEMA_CACHE[model] = schema
+    return schema
+
+
+def _split_paragraphs(text: str, max_chars: int = 3500) -> List[str]:
+    """Split text into roughly max_chars chunks on paragraph boundaries.
+
+    Mirrors the chunker in content_processor but with the larger budget
+    used for direct client calls; an oversized paragraph stays whole.
+    """
+    if len(text) <= max_chars:
+        return [text]
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for paragraph in text.split("\n\n"):
+        if current and size + len(paragraph) > max_chars:
+            chunks.append("\n\n".join(current))
+            current = []
+            size = 0
+        current.append(paragraph)
+        size += len(paragraph) + 2
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def _merge_extractions(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge per-chunk extraction results, deduplicating case-insensitively.
+
+    Entities are keyed by name, relations by the (from, to, type) triple;
+    the first occurrence wins so chunk order is preserved.
+    """
+    entities: Dict[str, Dict[str, Any]] = {}
+    relations: Dict[tuple, Dict[str, Any]] = {}
+    for result in results:
+        for entity in result.get("entities", []):
+            name = str(entity.get("name", "")).strip()
+            if name:
+                entities.setdefault(name.casefold(), entity)
+        for relation in result.get("relations", []):
+            key = (
+                str(relation.get("from", "")).strip().casefold(),
+                str(relation.get("to", "")).strip().casefold(),
+                str(relation.get("type", "")).strip().casefold(),
+            )
+            if key[0] and key[1]:
+                relations.setdefault(key, relation)
+    return {
+        "entities": list(entities.values()),
+        "relations": list(relations.values()),
+    }
+
 
 class LLMError(Exception):
     """Base exception for LLM-related errors."""
@@ -27,6 +117,17 @@ class LLMError(Exception):
 class LLMClient:
     """Local LLM client for entity and relation extraction."""
 
+    # Seconds a health_check result stays cached; a full LLM ping per
+    # /health poll would otherwise dominate that endpoint's latency
+    _HEALTH_TTL = 30.0
+
+    # Entries kept in the in-memory extraction result LRU
+    _RESULT_CACHE_MAX = 1024
+
+    # Attempts per LLM call before giving up (and, on the extraction
+    # path, before the rule-based fallback engages)
+    _MAX_LLM_ATTEMPTS = 4
+
     def __init__(self, config: Optional[LLMConfig] = None) -> None:
         """Initialize the LLM client.
 
@@ -34,6 +135,57 @@ class LLMClient:
             config: Configuration object. If None, creates default config.
         """
         self.config = config or LLMConfig()
+        # Lazily-created pooled HTTP client: reusing one connection across
+        # requests skips the TCP handshake and pool setup per call
+        self._http: Optional[httpx.Client] = None
+        self._ahttp: Optional[httpx.AsyncClient] = None
+        self._health_cache: Optional[Dict[str, Any]] = None
+        self._health_checked_at = 0.0
+        # Exact-match result cache: re-ingesting the same chunk (PDF
+        # re-index, retry loops) skips the whole LLM round trip
+        self._result_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def _get_http(self) -> httpx.Client:
+        if self._http is None:
+            self._http = httpx.Client(
+                timeout=self.config.timeout,
+                limits=httpx.Limits(
+                    max_keepalive_connections=10, max_connections=20
+                ),
+                # One transparent retry absorbs a dropped keep-alive socket
+                # without surfacing a transient ConnectError to callers
+                transport=httpx.HTTPTransport(retries=1),
+            )
+        return self._http
+
+    def _get_async_http(self) -> httpx.AsyncClient:
+        if self._ahttp is None:
+            self._ahttp = httpx.AsyncClient(
+                timeout=self.config.timeout,
+                limits=httpx.Limits(
+                    max_keepalive_connections=10, max_connections=20
+                ),
+                transport=httpx.AsyncHTTPTransport(retries=1),
+            )
+        return self._ahttp
+
+    def close(self) -> None:
+        """Close the pooled HTTP client (reopened on next use)."""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+
+    async def aclose(self) -> None:
+        """Close the pooled async HTTP client (reopened on next use)."""
+        if self._ahttp is not None:
+            await self._ahttp.aclose()
+            self._ahttp = None
+
+    def __enter__(self) -> "LLMClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
     def extract_entities_relations(
         self,
@@ -57,19 +209,47 @@ class LLMClient:
         if not text or not text.strip():
             return {"entities": [], "relations": []}
 
-        prompt = build_extraction_prompt(text, source_type)
-
-        # Try local LLM first
+        cache_key = hashlib.blake2b(
+            f"{self.config.model}|{source_type}|{text}".encode("utf-8"),
+            digest_size=16,
+        ).hexdigest()
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            self._result_cache.move_to_end(cache_key)
+            return cached
+
+        # Static instructions go in the system field so a backend with
+        # prompt caching reuses the prefix; only the user message varies
+        prompt = build_user_message(text, source_type)
+
+        # Try local LLM first; transient failures are retried before the
+        # fallback gets a chance, so one 429/timeout does not degrade the
+        # result to rule-based output
         try:
-            response = self._call_local_llm(prompt, format_model=ContentAnalysis)
+            response = self._call_with_retry(
+                prompt,
+                format_model=ContentAnalysis,
+                system=build_system_prompt(),
+            )
             result = parse_llm_response(response)
             logger.info(
-                f"LLM extraction successful: {len(result.get('entities', []))} entities, "
-                f"{len(result.get('relations', []))} relations"
+                "LLM extraction successful: %d entities, %d relations",
+                len(result.get("entities", [])),
+                len(result.get("relations", [])),
             )
+            self._result_cache[cache_key] = result
+            if len(self._result_cache) > self._RESULT_CACHE_MAX:
+                self._result_cache.popitem(last=False)
             return result
         except Exception as e:
-            logger.exception(f"Local LLM call failed: {e}")
+            logger.exception("Local LLM call failed")
+            if self.config.fallback_enabled:
+                logger.info("Falling back to rule-based extraction")
+                # degraded marks rule-based output so callers with durable
+                # caches do not pin it over a later healthy extraction
+                result = extract_entities_relations_fallback(text)
+                result["degraded"] = True
+                return result
             # If fallback disabled or fallback failed, raise LLMError
             raise LLMError(f"Local LLM failed and fallback disabled: {e}")
 
@@ -99,21 +279,58 @@ class LLMClient:
             return response
 
         try:
-            return json.loads(response)
+            return _loads(response)
         except json.JSONDecodeError as e:
             raise LLMError(f"LLM returned invalid JSON: {e}")
 
+    def _call_with_retry(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        format_model: Optional[Type[BaseModel]] = None,
+        system: Optional[str] = None,
+    ) -> Any:
+        """Call the local LLM, retrying transient failures with backoff.
+
+        Rate-limit and transport hiccups get up to _MAX_LLM_ATTEMPTS tries
+        with full-jitter exponential delays (capped at 30s); deterministic
+        failures surface immediately so callers keep their fast error path.
+        """
+        delay = 1.0
+        for attempt in range(1, self._MAX_LLM_ATTEMPTS + 1):
+            try:
+                return self._call_local_llm(
+                    prompt, model, format_model=format_model, system=system
+                )
+            except LLMError as e:
+                message = str(e).casefold()
+                transient = any(marker in message for marker in _RETRYABLE_MARKERS)
+                if not transient or attempt == self._MAX_LLM_ATTEMPTS:
+                    raise
+                sleep_for = random.uniform(0, delay)
+                logger.warning(
+                    "Transient LLM failure (attempt %d/%d), retrying in %.1fs: %s",
+                    attempt,
+                    self._MAX_LLM_ATTEMPTS,
+                    sleep_for,
+                    e,
+                )
+                time.sleep(sleep_for)
+                delay = min(delay * 2, 30.0)
+
     def _call_local_llm(
         self,
         prompt: str,
         model: Optional[str] = None,
         format_model: Optional[Type[BaseModel]] = None,
+        system: Optional[str] = None,
     ) -> Any:
         """Make HTTP request to local LLM endpoint.
 
         Args:
             prompt: Text prompt to send
             model: Model name to use
+            system: Optional static system message (cacheable prefix)
 
         Returns:
             Raw response text from LLM
@@ -123,56 +340,214 @@ class LLMClient:
         """
         model_name = model or self.config.model
         payload = {"prompt": prompt, "model": model_name, "stream": False}
+        if system is not None:
+            payload["system"] = system
 
-        # If a Pydantic model (class or instance) is provided, serialize
-        # its JSON schema and forward it as the Ollama/OpenAI `format` field.
-        # if format_model is not None:
-        #     payload["format"] = format_model.model_json_schema()
+        # If a Pydantic model is provided, forward its (cached) JSON schema
+        # as the Ollama/OpenAI `format` field for structured output
+        if format_model is not None:
+            payload["format"] = _schema_for(format_model)
 
         try:
-            with httpx.Client(timeout=self.config.timeout) as client:
-                resp = client.post(self.config.url, json=payload)
-                resp.raise_for_status()
+            resp = self._get_http().post(self.config.url, json=payload)
+            return self._unwrap_response(resp)
+        except Exception as e:
+            logger.exception("Local LLM HTTP request failed")
+            raise LLMError(f"Local LLM HTTP request failed: {e}")
 
-                raw_text = resp.text
-                logger.info(f"LLM raw response: {raw_text}")
+    @staticmethod
+    def _unwrap_response(resp) -> Any:
+        """Extract the LLM payload from an HTTP response body.
 
-                # Try to parse standard JSON responses first
-                try:
-                    data = resp.json()
-                except Exception:
-                    data = None
-
-                if isinstance(data, dict):
-                    # Common LLM HTTP wrappers
-                    for key in ("response", "text", "content", "result", "message"):
-                        if key in data:
-                            # For chat message objects, extract content
-                            if key == "message" and isinstance(data[key], dict):
-                                return data[key].get("content", data)
-                            return data[key]
-
-                    # If dict looks already like the desired response, return it
-                    return data
-
-                # If response body is plain text, try to parse as JSON string
-                text = raw_text or ""
-                try:
-                    return json.loads(text)
-                except Exception:
-                    # Fallback to returning raw text
-                    return text
+        Parses the body bytes once; the decoded-str form (resp.text) is
+        only built for the plain-text fallback and debug logging, so a
+        normal JSON response is materialized a single time.
+        """
+        resp.raise_for_status()
 
-        except httpx.HTTPError as e:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("LLM raw response: %s", resp.text)
+
+        # Try to parse standard JSON responses first; _loads over the raw
+        # bytes skips the str decode, resp.json() covers anything else
+        try:
+            data = _loads(resp.content)
+        except Exception:
+            try:
+                data = resp.json()
+            except Exception:
+                data = None
+
+        if isinstance(data, dict):
+            # Common LLM HTTP wrappers
+            for key in ("response", "text", "content", "result", "message"):
+                if key in data:
+                    # For chat message objects, extract content
+                    if key == "message" and isinstance(data[key], dict):
+                        return data[key].get("content", data)
+                    return data[key]
+
+            # If dict looks already like the desired response, return it
+            return data
+
+        # Non-dict JSON (list, string, number) passes through as parsed
+        if data is not None:
+            return data
+
+        # Fallback: body is not JSON at all, return the decoded text
+        return resp.text or ""
+
+    async def _acall_local_llm(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        system: Optional[str] = None,
+    ) -> Any:
+        """Async twin of _call_local_llm on the pooled AsyncClient."""
+        payload = {
+            "prompt": prompt,
+            "model": model or self.config.model,
+            "stream": False,
+        }
+        if system is not None:
+            payload["system"] = system
+        try:
+            resp = await self._get_async_http().post(self.config.url, json=payload)
+            return self._unwrap_response(resp)
+        except Exception as e:
             logger.exception("Local LLM HTTP request failed")
             raise LLMError(f"Local LLM HTTP request failed: {e}")
 
+    async def agenerate(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Async twin of generate on the pooled AsyncClient."""
+        response = await self._acall_local_llm(prompt, model)
+
+        if isinstance(response, dict):
+            return response
+
+        try:
+            return _loads(response)
+        except json.JSONDecodeError as e:
+            raise LLMError(f"LLM returned invalid JSON: {e}")
+
+    async def aextract_many(
+        self,
+        texts: List[str],
+        source_type: str = "text",
+    ) -> List[Dict[str, Any]]:
+        """Extract from many texts concurrently, bounded by max_concurrency.
+
+        Wall-clock time approaches ceil(N / max_concurrency) round trips
+        instead of N sequential ones. Results come back in input order;
+        each text gets the same per-chunk fallback semantics as the sync
+        extraction path.
+        """
+        semaphore = asyncio.Semaphore(self.config.max_concurrency)
+
+        async def extract_one(text: str) -> Dict[str, Any]:
+            if not text or not text.strip():
+                return {"entities": [], "relations": []}
+            async with semaphore:
+                prompt = build_user_message(text, source_type)
+                try:
+                    response = await self._acall_local_llm(
+                        prompt, system=build_system_prompt()
+                    )
+                    return parse_llm_response(response)
+                except Exception as e:
+                    logger.exception("Local LLM call failed")
+                    if self.config.fallback_enabled:
+                        result = extract_entities_relations_fallback(text)
+                        result["degraded"] = True
+                        return result
+                    raise LLMError(f"Local LLM failed and fallback disabled: {e}")
+
+        return list(await asyncio.gather(*(extract_one(t) for t in texts)))
+
+    def extract_entities_relations_batch(
+        self,
+        texts: List[str],
+        source_type: str = "text",
+    ) -> List[Dict[str, Any]]:
+        """Extract from many texts in one go, for synchronous callers.
+
+        The local /api/generate endpoint takes a single prompt per
+        request, so the batch is amortized over concurrent in-flight
+        requests (aextract_many) rather than a multi-prompt payload:
+        one event loop, one pooled client, ceil(N / max_concurrency)
+        round trips of wall-clock time. Results come back in input order.
+        """
+        if not texts:
+            return []
+
+        async def _run() -> List[Dict[str, Any]]:
+            try:
+                return await self.aextract_many(texts, source_type)
+            finally:
+                # asyncio.run tears the loop down; the pooled AsyncClient
+                # must not outlive the loop it was created on
+                await self.aclose()
+
+        return asyncio.run(_run())
+
+    async def extract_entities_relations_async(
+        self,
+        text: str,
+        source_type: str = "text",
+        source_path: Optional[str] = None,
+        max_concurrency: int = 4,
+    ) -> Dict[str, Any]:
+        """Extract from long text by fanning chunks out concurrently.
+
+        The text is split on paragraph boundaries and each chunk becomes
+        its own LLM request; a semaphore caps in-flight requests so the
+        local endpoint is not flooded. End-to-end latency approaches the
+        slowest chunk instead of the sum of all of them. Results are
+        merged with case-insensitive dedup by entity name and relation
+        triple. Falls back per-chunk to rule-based extraction when
+        enabled, like the sync path.
+        """
+        if not text or not text.strip():
+            return {"entities": [], "relations": []}
+
+        chunks = _split_paragraphs(text)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def extract_chunk(chunk: str) -> Dict[str, Any]:
+            async with semaphore:
+                prompt = build_user_message(chunk, source_type)
+                try:
+                    response = await self._acall_local_llm(
+                        prompt, system=build_system_prompt()
+                    )
+                    return parse_llm_response(response)
+                except Exception as e:
+                    logger.exception("Local LLM call failed")
+                    if self.config.fallback_enabled:
+                        result = extract_entities_relations_fallback(chunk)
+                        result["degraded"] = True
+                        return result
+                    raise LLMError(f"Local LLM failed and fallback disabled: {e}")
+
+        results = await asyncio.gather(*(extract_chunk(c) for c in chunks))
+        return _merge_extractions(list(results))
+
     def health_check(self) -> Dict[str, Any]:
         """Check LLM client health and connectivity.
 
         Returns:
             Dictionary with health status information
         """
+        if (
+            self._health_cache is not None
+            and time.monotonic() - self._health_checked_at < self._HEALTH_TTL
+        ):
+            return self._health_cache
+
         status = {
             "model": self.config.model,
             "url": self.config.url,
@@ -188,4 +563,19 @@ class LLMClient:
         except Exception as e:
             status["connectivity"] = f"error: {str(e)}"
 
+        self._health_cache = status
+        self._health_checked_at = time.monotonic()
         return status
+
+
+# Process-wide shared client: reusing one instance keeps the pooled HTTP
+# connections (and their DNS/keep-alive state) alive across call sites
+_LLM_SINGLETON: Optional[LLMClient] = None
+
+
+def get_llm_client() -> LLMClient:
+    """Return the lazily-created shared LLMClient."""
+    global _LLM_SINGLETON
+    if _LLM_SINGLETON is None:
+        _LLM_SINGLETON = LLMClient()
+    return _LLM_SINGLETON
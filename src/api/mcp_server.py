@@ -8,9 +8,9 @@ import json
 import logging
 from typing import Any, Callable, Dict, List, Optional
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Library-safe logging: basicConfig runs only in the __main__ entrypoint
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
 
 class Tool:
@@ -604,6 +604,7 @@ class MCPServer:
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     try:
         asyncio.run(MCPServer().start())
     except KeyboardInterrupt:
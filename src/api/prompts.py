@@ -1,17 +1,10 @@
 """Prompt templates for LLM entity and relation extraction."""
 
-
-def build_extraction_prompt(text: str, source_type: str) -> str:
-    """Build extraction prompt for LLM.
-
-    Args:
-        text: Input text to process
-        source_type: Type of source (text, pdf, video)
-
-    Returns:
-        Formatted prompt string
-    """
-    return f"""Tarefa:
+# Static instruction block (rules, analysis steps, output format and
+# example), built once at import. Keeping it byte-identical across calls
+# lets backends with prompt/prefix caching reuse the processed tokens;
+# only the small user message below varies per chunk.
+_SYSTEM_PROMPT = """Tarefa:
 Você receberá um texto-fonte. Sua missão é ajudar a aprender o conteúdo identificando entidades e relações entre elas, para construir um grafo de conhecimento (como uma wiki) e servir de base para um infográfico.
 
 Regras gerais:
@@ -44,64 +37,91 @@ Passos de análise (internos):
 7) Valide o JSON: chaves corretas, aspas duplas, sem vírgulas sobrando.
 
 Formato de saída (JSON):
-{{
+{
   "entities": [
-    {{
+    {
       "name": "Nome da Entidade", 
       "type": "tipo", 
       "description": "descrição em PT-BR com até 25 palavras"
-    }}
+    }
   ],
   "relations": [
-    {{
+    {
       "from": "Entidade1", 
       "to": "Entidade2", 
       "type": "tipo_relacao", 
       "evidence": "Citação curta do texto ou explicação objetiva baseada no texto"
-    }}
+    }
   ]
-}}
+}
 
 Exemplo (apenas demonstrativo):
-{{
+{
   "entities": [
-    {{
+    {
       "name": "Aprendizado Baseado em Grafos", 
       "type": "conceito", 
       "description": "Estratégia que organiza conhecimento como nós e arestas para facilitar entendimento e revisão."
-    }},
-    {{
+    },
+    {
       "name": "Entidade", 
       "type": "conceito", 
       "description": "Elemento fundamental do grafo representando um conceito, pessoa, lugar, evento ou objeto."
-    }},
-    {{
+    },
+    {
       "name": "Relação", 
       "type": "conceito", 
       "description": "Ligação semântica entre entidades que expressa dependência, causalidade, composição ou associação."
-    }}
+    }
   ],
   "relations": [
-    {{
+    {
       "from": "Aprendizado Baseado em Grafos", 
       "to": "Entidade", 
       "type": "parte_de", 
       "evidence": "O método define entidades e relações como componentes do grafo."
-    }},
-    {{
+    },
+    {
       "from": "Aprendizado Baseado em Grafos", 
       "to": "Relação", 
       "type": "parte_de", 
       "evidence": "A abordagem usa relações para conectar conceitos no grafo."
-    }},
-    {{
+    },
+    {
       "from": "Entidade", 
       "to": "Relação", 
       "type": "relacionado_a", 
       "evidence": "As entidades são conectadas por relações."
-    }}
+    }
   ]
-}}
+}"""
 
-TEXTO ({source_type}):
+_USER_TEMPLATE = """TEXTO ({source_type}):
 {text}"""
+
+
+def build_system_prompt() -> str:
+    """Return the static instruction block shared by every extraction call."""
+    return _SYSTEM_PROMPT
+
+
+def build_user_message(text: str, source_type: str) -> str:
+    """Build the per-chunk user message (just the source text)."""
+    return _USER_TEMPLATE.format_map({"source_type": source_type, "text": text})
+
+
+def build_extraction_prompt(text: str, source_type: str) -> str:
+    """Build the full single-string extraction prompt.
+
+    Kept for callers that send one combined prompt; backends that accept
+    a separate system message should use build_system_prompt plus
+    build_user_message so the static prefix stays cacheable.
+
+    Args:
+        text: Input text to process
+        source_type: Type of source (text, pdf, video)
+
+    Returns:
+        Formatted prompt string
+    """
+    return _SYSTEM_PROMPT + "\n\n" + build_user_message(text, source_type)
@@ -1,9 +1,14 @@
 """Response parser for LLM outputs."""
 
-import json
 import logging
-import re
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    # orjson's SIMD-accelerated parser is 2-6x faster on the multi-KB
+    # documents the extraction prompt produces; optional dependency
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
 
 logger = logging.getLogger(__name__)
 
@@ -22,38 +27,95 @@ def parse_llm_response(response: str) -> Dict[str, Any]:
 
     # Clean the response
     response = response.strip()
+    response = _strip_code_fence(response)
 
     # Try to parse as direct JSON
     try:
-        result = json.loads(response)
+        result = _loads(response)
         if _is_valid_extraction_result(result):
             return result
-    except json.JSONDecodeError:
+    except ValueError:
         pass
 
-    # Try to extract JSON from response using regex patterns
-    json_patterns = [
-        r"```json\s*(\{.*?\})\s*```",  # JSON in code blocks
-        r"```\s*(\{.*?\})\s*```",  # JSON in generic code blocks
-        r'(\{[^{}]*"entities"[^{}]*"relations"[^{}]*\})',  # Look for entities/relations pattern
-        r"(\{.*\})",  # Basic JSON pattern (greedy)
-    ]
-
-    for pattern in json_patterns:
-        matches = re.findall(pattern, response, re.DOTALL)
-        for match in matches:
-            try:
-                result = json.loads(match)
-                if _is_valid_extraction_result(result):
-                    return result
-            except json.JSONDecodeError:
-                continue
+    # Walk the response left to right, handing each balanced {...} slice to
+    # the JSON parser. A single depth-counting scan replaces the old greedy
+    # re.DOTALL patterns, whose backtracking was quadratic on long outputs
+    pos = 0
+    while True:
+        extracted = _extract_json_object(response, pos)
+        if extracted is None:
+            break
+        candidate, obj_start = extracted
+        try:
+            result = _loads(candidate)
+            if _is_valid_extraction_result(result):
+                return result
+        except ValueError:
+            pass
+        # Invalid or wrong-shaped object: resume just past its opening brace
+        # so an object nested inside it can still be found
+        pos = obj_start + 1
 
     # If no valid JSON found, return empty structure
     logger.warning(f"Could not parse LLM response as JSON: {response[:200]}...")
     return {"entities": [], "relations": []}
 
 
+def _strip_code_fence(response: str) -> str:
+    """Remove a surrounding ``` / ```json fence, if present.
+
+    Plain startswith/endswith checks; no regex needed for a fixed marker.
+    """
+    if response.startswith("```") and response.endswith("```"):
+        inner = response[3:-3]
+        if inner.startswith("json"):
+            inner = inner[4:]
+        return inner.strip()
+    return response
+
+
+def _extract_json_object(s: str, start: int = 0) -> Optional[Tuple[str, int]]:
+    """Slice the next balanced {...} object out of ``s``.
+
+    Counts brace depth while honoring string quoting and backslash escapes,
+    so braces inside JSON strings do not confuse the balance.
+
+    Args:
+        s: Text to scan
+        start: Index to start scanning from
+
+    Returns:
+        Tuple of (object slice, index of its opening brace), or None if no
+        balanced object begins at or after ``start``
+    """
+    obj_start = s.find("{", start)
+    if obj_start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escape = False
+    for i in range(obj_start, len(s)):
+        ch = s[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return s[obj_start : i + 1], obj_start
+
+    return None
+
+
 def _is_valid_extraction_result(result: Any) -> bool:
     """Check if result has expected structure for entity extraction.
 
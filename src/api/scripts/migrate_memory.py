@@ -1,53 +1,108 @@
 """
 Script to migrate memory data from JSONL to SQLite using the schema in database.py
 """
+import argparse
 import json
 import sys
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-import argparse
+if __package__ in (None, ""):
+    # Running as a plain script: make src/api importable. Package imports
+    # take the relative path below and skip the sys.path mutation.
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from database import DB_PATH, get_connection, init_db
+else:
+    from ..database import DB_PATH, get_connection, init_db
+
+
+# Records per bulk-loaded transaction. Name resolution SELECTs are further
+# split below to stay under SQLite's bound-variable limit (999).
+CHUNK_SIZE = 5000
+_MAX_VARS = 900
+
+
+def _resolve_ids(conn, names):
+    """Resolve a set of entity names to ids with batched IN queries."""
+    ids = {}
+    names = [n for n in names if n]
+    for start in range(0, len(names), _MAX_VARS):
+        batch = names[start:start + _MAX_VARS]
+        placeholders = ",".join("?" * len(batch))
+        for entity_id, name in conn.execute(
+            f"SELECT id, name FROM entities WHERE name IN ({placeholders})", batch
+        ):
+            ids[name] = entity_id
+    return ids
+
+
+def _flush_chunk(conn, records):
+    """Bulk-insert one chunk of parsed JSONL records inside a transaction."""
+    entity_rows = []
+    for obj in records:
+        entity = obj.get("entity")
+        if entity:
+            entity_rows.append(
+                (entity.get("name"), entity.get("entity_type"), entity.get("description"))
+            )
+        for rel in obj.get("relations", []):
+            to_name = rel.get("to_entity_name")
+            if to_name:
+                entity_rows.append((to_name, None, None))
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany(
+            "INSERT OR IGNORE INTO entities (name, entity_type, description) VALUES (?, ?, ?)",
+            entity_rows,
+        )
+
+        ids = _resolve_ids(conn, {row[0] for row in entity_rows})
+
+        obs_rows = []
+        rel_rows = []
+        for obj in records:
+            entity = obj.get("entity")
+            entity_id = ids.get(entity.get("name")) if entity else None
+            for obs in obj.get("observations", []):
+                obs_rows.append(
+                    (entity_id, obs.get("content"), obs.get("source_type"),
+                     obs.get("source_path"), obs.get("confidence", 1.0))
+                )
+            for rel in obj.get("relations", []):
+                rel_rows.append(
+                    (entity_id, ids.get(rel.get("to_entity_name")),
+                     rel.get("relation_type"), rel.get("strength", 1.0), rel.get("evidence"))
+                )
 
-from database import DB_PATH, get_connection, init_db
+        conn.executemany(
+            "INSERT INTO observations (entity_id, content, source_type, source_path, confidence) VALUES (?, ?, ?, ?, ?)",
+            obs_rows,
+        )
+        conn.executemany(
+            "INSERT INTO relations (from_entity_id, to_entity_id, relation_type, strength, evidence) VALUES (?, ?, ?, ?, ?)",
+            rel_rows,
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
 
 
 def migrate(jsonl_path, db_path=DB_PATH):
     init_db(db_path)
     conn = get_connection(db_path)
-    with conn:
-        with open(jsonl_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                obj = json.loads(line)
-                # Example: expects {"entity": {...}, "observations": [...], "relations": [...]} per line
-                entity = obj.get("entity")
-                if entity:
-                    conn.execute(
-                        "INSERT OR IGNORE INTO entities (name, entity_type, description) VALUES (?, ?, ?)",
-                        (entity.get("name"), entity.get("entity_type"), entity.get("description"))
-                    )
-                    entity_id = conn.execute("SELECT id FROM entities WHERE name=?", (entity["name"],)).fetchone()[0]
-                else:
-                    entity_id = None
-                for obs in obj.get("observations", []):
-                    conn.execute(
-                        "INSERT INTO observations (entity_id, content, source_type, source_path, confidence) VALUES (?, ?, ?, ?, ?)",
-                        (entity_id, obs.get("content"), obs.get("source_type"), obs.get("source_path"), obs.get("confidence", 1.0))
-                    )
-                for rel in obj.get("relations", []):
-                    from_id = entity_id
-                    to_name = rel.get("to_entity_name")
-                    if to_name:
-                        to_row = conn.execute("SELECT id FROM entities WHERE name=?", (to_name,)).fetchone()
-                        if not to_row:
-                            conn.execute("INSERT OR IGNORE INTO entities (name) VALUES (?)", (to_name,))
-                            to_row = conn.execute("SELECT id FROM entities WHERE name=?", (to_name,)).fetchone()
-                        to_id = to_row[0]
-                    else:
-                        to_id = None
-                    conn.execute(
-                        "INSERT INTO relations (from_entity_id, to_entity_id, relation_type, strength, evidence) VALUES (?, ?, ?, ?, ?)",
-                        (from_id, to_id, rel.get("relation_type"), rel.get("strength", 1.0), rel.get("evidence"))
-                    )
+    conn.isolation_level = None
+    # Load in chunks: each chunk is one executemany-per-table transaction
+    # instead of row-at-a-time inserts with per-row id lookups.
+    records = []
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            records.append(json.loads(line))
+            if len(records) >= CHUNK_SIZE:
+                _flush_chunk(conn, records)
+                records = []
+    if records:
+        _flush_chunk(conn, records)
     print(f"Migration complete. Data loaded into {db_path}")
 
 def main():
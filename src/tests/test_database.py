@@ -0,0 +1,102 @@
+import sqlite3
+
+import pytest
+
+from api import database
+
+
+@pytest.fixture
+def db_conn(tmp_path):
+    """A private connection to a fresh schema-bearing database file."""
+    db_path = tmp_path / "bulk_test.db"
+    conn = database.open_connection(str(db_path))
+    with conn:
+        conn.executescript(database.SCHEMA_SQL)
+    yield conn
+    conn.close()
+
+
+def test_add_entities_bulk_inserts_and_returns_id_map(db_conn):
+    """The bulk upsert stores every entity and maps names to their ids."""
+    entities = [
+        {"name": "Socrates", "type": "person", "description": "Philosopher"},
+        {"name": "Athens", "type": "place", "description": ""},
+    ]
+    ids = database.add_entities_bulk(db_conn, entities)
+
+    assert set(ids) == {"Socrates", "Athens"}
+    rows = db_conn.execute("SELECT id, name FROM entities").fetchall()
+    assert {row["name"]: row["id"] for row in rows} == ids
+
+
+def test_add_entities_bulk_merges_existing_rows(db_conn):
+    """Re-upserting keeps ids stable and fills only empty descriptions."""
+    first = database.add_entities_bulk(
+        db_conn, [{"name": "Athens", "type": "place", "description": ""}]
+    )
+    second = database.add_entities_bulk(
+        db_conn, [{"name": "Athens", "type": "place", "description": "Greek city"}]
+    )
+
+    assert second["Athens"] == first["Athens"]
+    row = db_conn.execute(
+        "SELECT description FROM entities WHERE name = 'Athens'"
+    ).fetchone()
+    assert row["description"] == "Greek city"
+    assert db_conn.execute("SELECT COUNT(*) FROM entities").fetchone()[0] == 1
+
+
+def test_add_relations_bulk_inserts_and_dedupes(db_conn):
+    """Relations are written once per (from, to, type) triple."""
+    ids = database.add_entities_bulk(
+        db_conn,
+        [
+            {"name": "Socrates", "type": "person", "description": ""},
+            {"name": "Athens", "type": "place", "description": ""},
+        ],
+    )
+    relation = {
+        "from_entity_id": ids["Socrates"],
+        "to_entity_id": ids["Athens"],
+        "relation_type": "lived_in",
+        "evidence": "biography",
+    }
+
+    written = database.add_relations_bulk(db_conn, [relation])
+    assert written == 1
+    database.add_relations_bulk(db_conn, [relation])
+    assert db_conn.execute("SELECT COUNT(*) FROM relations").fetchone()[0] == 1
+
+
+def test_add_relations_bulk_is_atomic_on_autocommit_connection(db_conn):
+    """A failing row rolls back the whole batch, even in autocommit mode.
+
+    Regression test: `with conn:` relied on the handle's isolation_level,
+    so a connection in autocommit mode (isolation_level = None) lost batch
+    atomicity silently.
+    """
+    db_conn.isolation_level = None
+    ids = database.add_entities_bulk(
+        db_conn, [{"name": "Socrates", "type": "person", "description": ""}]
+    )
+    relations = [
+        {
+            "from_entity_id": ids["Socrates"],
+            "to_entity_id": ids["Socrates"],
+            "relation_type": "knows",
+            "evidence": "",
+        },
+        # Nonexistent entity id: the FK constraint rejects this row
+        {
+            "from_entity_id": ids["Socrates"],
+            "to_entity_id": 999_999,
+            "relation_type": "knows",
+            "evidence": "",
+        },
+    ]
+
+    with pytest.raises(sqlite3.IntegrityError):
+        database.add_relations_bulk(db_conn, relations)
+
+    assert db_conn.execute("SELECT COUNT(*) FROM relations").fetchone()[0] == 0
+    assert not db_conn.in_transaction
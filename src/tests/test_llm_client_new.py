@@ -94,7 +94,7 @@ class TestLLMClientExtraction:
         # Mock HTTP client
         mock_client_instance = Mock()
         mock_client_instance.post.return_value = mock_response
-        mock_httpx_client.return_value.__enter__.return_value = mock_client_instance
+        mock_httpx_client.return_value = mock_client_instance
 
         client = LLMClient()
         result = client.extract_entities_relations("Test text")
@@ -104,11 +104,14 @@ class TestLLMClientExtraction:
         assert len(result["relations"]) == 1
         assert result["relations"][0]["from"] == "Test Entity"
 
+    @patch("api.llm_client.time.sleep")
     @patch("api.llm_client.httpx.Client")
-    def test_extract_with_llm_failure_fallback_enabled(self, mock_httpx_client):
+    def test_extract_with_llm_failure_fallback_enabled(
+        self, mock_httpx_client, mock_sleep
+    ):
         """Test extraction with LLM failure and fallback enabled."""
         # Mock HTTP client to raise an exception
-        mock_httpx_client.return_value.__enter__.side_effect = Exception(
+        mock_httpx_client.return_value.post.side_effect = Exception(
             "Connection error"
         )
 
@@ -119,11 +122,14 @@ class TestLLMClientExtraction:
         assert "entities" in result
         assert "relations" in result
 
+    @patch("api.llm_client.time.sleep")
     @patch("api.llm_client.httpx.Client")
-    def test_extract_with_llm_failure_fallback_disabled(self, mock_httpx_client):
+    def test_extract_with_llm_failure_fallback_disabled(
+        self, mock_httpx_client, mock_sleep
+    ):
         """Test extraction with LLM failure and fallback disabled."""
         # Mock HTTP client to raise an exception
-        mock_httpx_client.return_value.__enter__.side_effect = Exception(
+        mock_httpx_client.return_value.post.side_effect = Exception(
             "Connection error"
         )
 
@@ -134,6 +140,86 @@ class TestLLMClientExtraction:
         with pytest.raises(LLMError, match="Local LLM failed and fallback disabled"):
             client.extract_entities_relations("Test text")
 
+    @patch("api.llm_client.httpx.Client")
+    def test_extract_retries_transient_failure_before_fallback(
+        self, mock_httpx_client, monkeypatch
+    ):
+        """A transient failure is retried and still yields the LLM result."""
+        sleeps = []
+        monkeypatch.setattr("api.llm_client.time.sleep", sleeps.append)
+
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            "response": json.dumps(
+                {
+                    "entities": [
+                        {"name": "Real Entity", "type": "conceito", "description": ""}
+                    ],
+                    "relations": [],
+                }
+            )
+        }
+        mock_response.raise_for_status.return_value = None
+
+        mock_client_instance = Mock()
+        # Two transient transport failures, then a genuine LLM response
+        mock_client_instance.post.side_effect = [
+            Exception("429 rate limit exceeded"),
+            Exception("connection timed out"),
+            mock_response,
+        ]
+        mock_httpx_client.return_value = mock_client_instance
+
+        client = LLMClient()
+        result = client.extract_entities_relations("Test text")
+
+        # Fallback never engaged: the result is the parsed LLM output
+        assert result["entities"][0]["name"] == "Real Entity"
+        assert mock_client_instance.post.call_count == 3
+        # Full jitter: each sleep drawn from [0, delay] with delay doubling
+        assert len(sleeps) == 2
+        assert 0 <= sleeps[0] <= 1.0
+        assert 0 <= sleeps[1] <= 2.0
+
+    @patch("api.llm_client.httpx.Client")
+    def test_extract_non_transient_failure_not_retried(
+        self, mock_httpx_client, monkeypatch
+    ):
+        """A deterministic failure goes straight to fallback, no sleeps."""
+        sleeps = []
+        monkeypatch.setattr("api.llm_client.time.sleep", sleeps.append)
+
+        mock_client_instance = Mock()
+        mock_client_instance.post.side_effect = Exception("malformed request")
+        mock_httpx_client.return_value = mock_client_instance
+
+        client = LLMClient()
+        result = client.extract_entities_relations("Text naming 'Something'")
+
+        assert "entities" in result
+        assert mock_client_instance.post.call_count == 1
+        assert sleeps == []
+
+    @patch("api.llm_client.httpx.Client")
+    def test_extract_exhausts_attempts_then_raises(
+        self, mock_httpx_client, monkeypatch
+    ):
+        """Persistent transient failures surface after the attempt budget."""
+        monkeypatch.setattr("api.llm_client.time.sleep", lambda s: None)
+
+        mock_client_instance = Mock()
+        mock_client_instance.post.side_effect = Exception("connection refused")
+        mock_httpx_client.return_value = mock_client_instance
+
+        config = LLMConfig()
+        config.fallback_enabled = False
+        client = LLMClient(config=config)
+
+        with pytest.raises(LLMError):
+            client.extract_entities_relations("Test text")
+
+        assert mock_client_instance.post.call_count == LLMClient._MAX_LLM_ATTEMPTS
+
 
 class TestLLMClientGenerate:
     """Test LLM generate method."""
@@ -149,7 +235,7 @@ class TestLLMClientGenerate:
         # Mock HTTP client
         mock_client_instance = Mock()
         mock_client_instance.post.return_value = mock_response
-        mock_httpx_client.return_value.__enter__.return_value = mock_client_instance
+        mock_httpx_client.return_value = mock_client_instance
 
         client = LLMClient()
         result = client.generate("Test prompt")
@@ -167,7 +253,7 @@ class TestLLMClientGenerate:
         # Mock HTTP client
         mock_client_instance = Mock()
         mock_client_instance.post.return_value = mock_response
-        mock_httpx_client.return_value.__enter__.return_value = mock_client_instance
+        mock_httpx_client.return_value = mock_client_instance
 
         client = LLMClient()
         client.generate("Test prompt", model="custom-model")
@@ -187,7 +273,7 @@ class TestLLMClientGenerate:
         # Mock HTTP client
         mock_client_instance = Mock()
         mock_client_instance.post.return_value = mock_response
-        mock_httpx_client.return_value.__enter__.return_value = mock_client_instance
+        mock_httpx_client.return_value = mock_client_instance
 
         client = LLMClient()
 
@@ -198,7 +284,7 @@ class TestLLMClientGenerate:
     def test_generate_http_error(self, mock_httpx_client):
         """Test generate with HTTP error."""
         # Mock HTTP client to raise an exception
-        mock_httpx_client.return_value.__enter__.side_effect = Exception(
+        mock_httpx_client.return_value.post.side_effect = Exception(
             "Connection error"
         )
 
@@ -233,7 +319,7 @@ class TestLLMClientHealthCheck:
         # Mock HTTP client
         mock_client_instance = Mock()
         mock_client_instance.post.return_value = mock_response
-        mock_httpx_client.return_value.__enter__.return_value = mock_client_instance
+        mock_httpx_client.return_value = mock_client_instance
 
         client = LLMClient()
         status = client.health_check()
@@ -245,7 +331,7 @@ class TestLLMClientHealthCheck:
     def test_health_check_connectivity_failure(self, mock_httpx_client):
         """Test health check with connectivity failure."""
         # Mock HTTP client to raise an exception
-        mock_httpx_client.return_value.__enter__.side_effect = Exception(
+        mock_httpx_client.return_value.post.side_effect = Exception(
             "Connection error"
         )
 